@@ -27,6 +27,13 @@ class UsersConfig(AppConfig):
         User = get_user_model()
         post_save.connect(create_user, sender=User)
 
+        # 注册部门的保存与删除信号，维护部门闭包表
+        from django.db.models.signals import pre_delete
+        from .models import Dept, DeptClosure
+
+        post_save.connect(DeptClosure.handle_dept_save, sender=Dept)
+        pre_delete.connect(DeptClosure.handle_dept_delete, sender=Dept)
+
         # 初始化缓存
         from django.core.cache import cache
 
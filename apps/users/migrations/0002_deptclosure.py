@@ -0,0 +1,70 @@
+# Generated by Django 4.2.16 on 2026-10-16 10:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_dept_closure(apps, schema_editor):
+    """根据现有部门的上下级关系生成闭包表"""
+    Dept = apps.get_model("users", "Dept")
+    DeptClosure = apps.get_model("users", "DeptClosure")
+
+    parents = dict(Dept.objects.values_list("id", "pid_id"))
+    links = []
+    for dept_id in parents:
+        ancestor_id, depth, seen = dept_id, 0, set()
+        while ancestor_id is not None and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            links.append(DeptClosure(ancestor_id=ancestor_id, descendant_id=dept_id, depth=depth))
+            ancestor_id, depth = parents.get(ancestor_id), depth + 1
+    DeptClosure.objects.bulk_create(links, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeptClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "depth",
+                    models.PositiveIntegerField(default=0, verbose_name="层级距离"),
+                ),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_links",
+                        to="users.dept",
+                        verbose_name="祖先部门",
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ancestor_links",
+                        to="users.dept",
+                        verbose_name="后代部门",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("ancestor", "descendant")},
+            },
+        ),
+        migrations.RunPython(build_dept_closure, migrations.RunPython.noop),
+    ]
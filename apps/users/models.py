@@ -1,6 +1,6 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
 
 from utils.baseDRF import BaseEntity
 
@@ -86,6 +86,80 @@ class Dept(BaseEntity):
         verbose_name="上级部门",
     )
 
+    def get_descendant_ids(self):
+        """获取当前部门及所有子部门的ID"""
+        return list(DeptClosure.objects.filter(ancestor_id=self.pk).values_list("descendant_id", flat=True))
+
+    def is_child_of(self, dept):
+        """判断是否为指定部门本身或其子部门"""
+        if dept is None:
+            return False
+        return DeptClosure.objects.filter(ancestor_id=dept.pk, descendant_id=self.pk).exists()
+
+
+class DeptClosure(models.Model):
+    """部门闭包表：记录所有祖先-后代关系（包含自身），子树查询只需一次索引查找"""
+
+    ancestor = models.ForeignKey(
+        "Dept",
+        on_delete=models.CASCADE,
+        related_name="descendant_links",
+        verbose_name="祖先部门",
+    )
+    descendant = models.ForeignKey(
+        "Dept",
+        on_delete=models.CASCADE,
+        related_name="ancestor_links",
+        verbose_name="后代部门",
+    )
+    depth = models.PositiveIntegerField(default=0, verbose_name="层级距离")
+
+    class Meta:
+        unique_together = ("ancestor", "descendant")
+
+    @classmethod
+    def handle_dept_save(cls, sender, instance, created=False, **kwargs):
+        """部门新建或移动后，重建其子树与新上级之间的关系；上级未变化时不做修改"""
+        with transaction.atomic():
+            if created:
+                subtree = {instance.pk: 0}
+                cls.objects.create(ancestor_id=instance.pk, descendant_id=instance.pk, depth=0)
+            else:
+                # 自身（depth=0）与当前上级（depth=1）的关系，改名等保存只需这一次查询
+                links = dict(
+                    cls.objects.filter(descendant_id=instance.pk, depth__lte=1).values_list("depth", "ancestor_id")
+                )
+                if 0 in links and links.get(1) == instance.pid_id:
+                    return
+
+                subtree = dict(cls.objects.filter(ancestor_id=instance.pk).values_list("descendant_id", "depth"))
+                if not subtree:
+                    subtree = {instance.pk: 0}
+                    cls.objects.create(ancestor_id=instance.pk, descendant_id=instance.pk, depth=0)
+
+                # 断开子树与子树外祖先的关系
+                cls.objects.filter(descendant_id__in=subtree).exclude(ancestor_id__in=subtree).delete()
+
+            # 连接新上级的所有祖先
+            if instance.pid_id:
+                ancestors = cls.objects.filter(descendant_id=instance.pid_id).values_list("ancestor_id", "depth")
+                cls.objects.bulk_create(
+                    [
+                        cls(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=ancestor_depth + depth + 1)
+                        for ancestor_id, ancestor_depth in ancestors
+                        for descendant_id, depth in subtree.items()
+                    ]
+                )
+
+    @classmethod
+    def handle_dept_delete(cls, sender, instance, **kwargs):
+        """部门删除前，子部门成为顶级部门，断开其与原祖先的关系"""
+        with transaction.atomic():
+            children = list(
+                cls.objects.filter(ancestor_id=instance.pk, depth__gt=0).values_list("descendant_id", flat=True)
+            )
+            cls.objects.filter(descendant_id__in=children).exclude(ancestor_id__in=children).delete()
+
 
 class User(BaseEntity, AbstractUser):
     """用户"""
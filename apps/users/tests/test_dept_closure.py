@@ -0,0 +1,116 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+
+from users.models import Dept, DeptClosure
+
+
+class DeptClosureTests(TestCase):
+    """部门闭包表测试"""
+
+    def setUp(self):
+        self.root = Dept.objects.create(name="总公司")
+        self.branch = Dept.objects.create(name="分公司", pid=self.root)
+        self.team = Dept.objects.create(name="研发部", pid=self.branch)
+        self.other = Dept.objects.create(name="子公司")
+
+    def links(self):
+        return set(DeptClosure.objects.values_list("ancestor_id", "descendant_id", "depth"))
+
+    def test_create(self):
+        """测试新建部门生成自身及所有祖先的关系"""
+        self.assertEqual(
+            self.links(),
+            {
+                (self.root.pk, self.root.pk, 0),
+                (self.branch.pk, self.branch.pk, 0),
+                (self.team.pk, self.team.pk, 0),
+                (self.other.pk, self.other.pk, 0),
+                (self.root.pk, self.branch.pk, 1),
+                (self.branch.pk, self.team.pk, 1),
+                (self.root.pk, self.team.pk, 2),
+            },
+        )
+        self.assertCountEqual(self.root.get_descendant_ids(), [self.root.pk, self.branch.pk, self.team.pk])
+        self.assertTrue(self.team.is_child_of(self.root))
+        self.assertFalse(self.root.is_child_of(self.team))
+
+    def test_move(self):
+        """测试移动部门时整个子树改挂到新上级"""
+        self.branch.pid = self.other
+        self.branch.save()
+
+        self.assertTrue(self.team.is_child_of(self.other))
+        self.assertFalse(self.team.is_child_of(self.root))
+        self.assertIn((self.other.pk, self.team.pk, 2), self.links())
+        self.assertCountEqual(self.root.get_descendant_ids(), [self.root.pk])
+
+    def test_move_to_top(self):
+        """测试移动为顶级部门"""
+        self.branch.pid = None
+        self.branch.save()
+
+        self.assertFalse(self.team.is_child_of(self.root))
+        self.assertTrue(self.team.is_child_of(self.branch))
+
+    def test_save_without_move(self):
+        """测试上级未变化的保存不改动闭包表"""
+        links = set(DeptClosure.objects.values_list("pk", flat=True))
+        self.branch.name = "华东分公司"
+        self.branch.save()
+
+        self.assertEqual(set(DeptClosure.objects.values_list("pk", flat=True)), links)
+
+    def test_delete_with_children(self):
+        """测试删除部门后子部门成为顶级部门，孙部门关系保留"""
+        self.branch.delete()
+
+        self.team.refresh_from_db()
+        self.assertIsNone(self.team.pid_id)
+        self.assertFalse(self.team.is_child_of(self.root))
+        self.assertEqual(
+            self.links(),
+            {
+                (self.root.pk, self.root.pk, 0),
+                (self.team.pk, self.team.pk, 0),
+                (self.other.pk, self.other.pk, 0),
+            },
+        )
+
+
+class DeptClosureMigrationTests(TransactionTestCase):
+    """部门闭包表迁移测试"""
+
+    migrate_from = [("users", "0001_initial")]
+    migrate_to = [("users", "0002_deptclosure")]
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_backfill(self):
+        """测试迁移根据现有部门生成闭包表"""
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        old_apps = executor.loader.project_state(self.migrate_from).apps
+        OldDept = old_apps.get_model("users", "Dept")
+        root = OldDept.objects.create(name="总公司")
+        child = OldDept.objects.create(name="分公司", pid=root)
+        grandchild = OldDept.objects.create(name="研发部", pid=child)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_to)
+        new_apps = executor.loader.project_state(self.migrate_to).apps
+        NewDeptClosure = new_apps.get_model("users", "DeptClosure")
+
+        self.assertEqual(
+            set(NewDeptClosure.objects.values_list("ancestor_id", "descendant_id", "depth")),
+            {
+                (root.pk, root.pk, 0),
+                (child.pk, child.pk, 0),
+                (grandchild.pk, grandchild.pk, 0),
+                (root.pk, child.pk, 1),
+                (child.pk, grandchild.pk, 1),
+                (root.pk, grandchild.pk, 2),
+            },
+        )
@@ -2,6 +2,7 @@ from operator import itemgetter
 
 from django.contrib.auth import authenticate
 from django.contrib.auth.hashers import check_password
+from django.db.models import Case, F, Value, When
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter
@@ -18,7 +19,6 @@ from utils.custom import RolePermission
 from utils.error import ErrorCode
 from utils.response import ApiResponse
 from ..models import Menu, User
-from ..serializers.dept import UserSerializer
 from ..serializers.menu import MenuSerializer
 from ..serializers.user import UserCreateSerializer, UserInfoListSerializer, UserListSerializer, UserModifySerializer
 
@@ -166,25 +166,29 @@ class UserViewSet(CoreViewSet):
     def export(self, request):
         """导出用户数据为Excel文件"""
         import pandas as pd
-        from django.http import HttpResponse
 
-        users = User.objects.all()
-        # 序列化查询集为列表
-
-        user_data = UserSerializer(users, many=True).data  # 将查询集转换为列表以确保序列化
-
-        # 创建DataFrame
-        df = pd.DataFrame(user_data)
-
-        # 设置响应内容
-        response = HttpResponse(content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-        response["Content-Disposition"] = 'attachment; filename="用户数据.xlsx"'
+        from utils.other.excel import pandas_download_excel
+
+        # 直接取字段值，不实例化模型也不经过序列化器，性别在数据库中映射
+        users = User.objects.values(
+            "id",
+            "username",
+            "nick_name",
+            "phone",
+            "email",
+            gender_name=Case(When(gender=1, then=Value("男")), default=Value("女")),
+            dept_name=F("dept__name"),
+            parent_dept_name=F("dept__pid__name"),
+        )
+
+        # 由 pandas 按列构建DataFrame，无数据时也保留表头
+        df = pd.DataFrame.from_records(
+            users.iterator(chunk_size=2000),
+            columns=["id", "username", "nick_name", "phone", "email", "gender_name", "dept_name", "parent_dept_name"],
+        )
 
         # 将DataFrame写入Excel文件
-        with pd.ExcelWriter(response, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="用户数据")
-
-        return response
+        return pandas_download_excel(df, filename="用户数据.xlsx", sheet_name="用户数据")
 
 
 class UserBuildMenuView(APIView):
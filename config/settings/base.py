@@ -191,6 +191,14 @@ STATICFILES_FINDERS = [
 # ------------------------------------------------------------------------------
 MEDIA_ROOT = str(ROOT_DIR / "media")
 MEDIA_URL = "/media/"
+# 下载文件交由反向代理或对象存储发送，不经过 Django
+USE_SENDFILE = env.bool("DJANGO_USE_SENDFILE", default=False)
+# nginx 使用 X-Accel-Redirect，apache 使用 X-Sendfile
+SENDFILE_HEADER = env("DJANGO_SENDFILE_HEADER", default="X-Accel-Redirect")
+# nginx 中映射到 MEDIA_ROOT 的 internal location，见 nginx.conf 中的 location /protected/
+SENDFILE_URL = env("DJANGO_SENDFILE_URL", default="/protected/")
+# 对象存储预签名下载地址的有效期（秒）
+SENDFILE_URL_EXPIRE = 300
 
 # TEMPLATES
 # ------------------------------------------------------------------------------
@@ -237,6 +245,8 @@ EMAIL_BACKEND = env(
     default="django.core.mail.backends.smtp.EmailBackend",
 )
 EMAIL_TIMEOUT = 5
+# 每个 (host, port, username) 复用的邮件连接数
+EMAIL_POOL_SIZE = env.int("DJANGO_EMAIL_POOL_SIZE", default=4)
 
 # ADMIN
 # ------------------------------------------------------------------------------
@@ -569,6 +579,8 @@ REST_FRAMEWORK = {
     # 使用自定义的架构生成器
     # "DEFAULT_SCHEMA_CLASS": "config.extend_schema.CustomAutoSchema",
 }
+# utils.response.ApiJsonRenderer 使用 orjson 编码响应，跳过 DRF 的纯 Python JSONEncoder
+USE_ORJSON_RENDERER = env.bool("DJANGO_USE_ORJSON_RENDERER", default=False)
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "Backend API",
@@ -3,7 +3,7 @@ import hashlib
 import json
 import logging
 import time
-from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 from django.conf import settings
 from django.core.cache import cache
@@ -56,6 +56,30 @@ class CacheManager:
         cache.delete(cache_key, version=version)
         logger.debug(f"Cache delete: {cache_key}")
         
+    def get_many(self, keys: List[str], version: Optional[int] = None) -> Dict[str, Any]:
+        """批量获取缓存，返回命中的键值，键不带前缀"""
+        cache_keys = {self._make_key(key): key for key in keys}
+        values = cache.get_many(list(cache_keys), version=version)
+        logger.debug(f"Cache get many: {len(values)}/{len(cache_keys)} hits")
+        return {cache_keys[cache_key]: value for cache_key, value in values.items()}
+        
+    def set_many(
+        self,
+        data: Dict[str, Any],
+        timeout: Optional[int] = None,
+        version: Optional[int] = None
+    ) -> None:
+        """批量设置缓存"""
+        timeout = timeout if timeout is not None else self.timeout
+        cache.set_many({self._make_key(key): value for key, value in data.items()}, timeout, version=version)
+        logger.debug(f"Cache set many: {len(data)} keys", extra={"data": {"timeout": timeout}})
+        
+    def delete_many(self, keys: List[str], version: Optional[int] = None) -> None:
+        """批量删除缓存"""
+        cache_keys = [self._make_key(key) for key in keys]
+        cache.delete_many(cache_keys, version=version)
+        logger.debug(f"Cache delete many: {len(cache_keys)} keys")
+        
     def clear(self, pattern: Optional[str] = None) -> None:
         """清除缓存"""
         if pattern:
@@ -1,12 +1,19 @@
+import base64
 import os
+import queue
 import smtplib
+import threading
+from collections import OrderedDict
 from email.mime.application import MIMEApplication
+from email.mime.base import MIMEBase
 from email.mime.image import MIMEImage
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.utils import formataddr, formatdate, make_msgid
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from django.conf import settings
 from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
@@ -15,6 +22,96 @@ from django.utils.html import strip_tags
 
 from utils.log.logger import logger
 
+# 已打开的邮件连接池: {(host, port, username, password, use_tls, use_ssl): Queue[EmailBackend]}
+_POOL: Dict[Tuple[str, int, str, str, bool, bool], queue.Queue] = {}
+_POOL_LOCK = threading.Lock()
+
+# 附件后缀 -> MIME类型
+_MIMETYPES = MappingProxyType(
+    {
+        ".txt": "text/plain",
+        ".pdf": "application/pdf",
+        ".doc": "application/msword",
+        ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        ".xls": "application/vnd.ms-excel",
+        ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        ".png": "image/png",
+        ".jpg": "image/jpeg",
+        ".jpeg": "image/jpeg",
+        ".gif": "image/gif",
+    }
+)
+
+
+@lru_cache(maxsize=256)
+def _plain_text(body: str) -> str:
+    """
+    HTML转纯文本，不含标签的内容直接返回
+    :param body: HTML内容
+    :return: 纯文本内容
+    """
+    if "<" not in body:
+        return body
+    return strip_tags(body)
+
+
+class AttachmentCache:
+    """附件缓存，按 (路径, 修改时间, 大小) 缓存 base64 编码结果，同一附件群发时只编码一次"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._cache: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _encode(self, path: Path) -> str:
+        """读取并编码附件，命中缓存时直接返回"""
+        stat = path.stat()
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            payload = self._cache.get(key)
+            if payload is not None:
+                self._cache.move_to_end(key)
+                return payload
+
+        with open(path, "rb") as f:
+            payload = base64.encodebytes(f.read()).decode("ascii")
+
+        # 超过缓存容量的附件不缓存，淘汰最久未使用的条目
+        if len(payload) <= self.max_bytes:
+            with self._lock:
+                if key not in self._cache:
+                    self._cache[key] = payload
+                    self._size += len(payload)
+                while self._size > self.max_bytes:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._size -= len(evicted)
+        return payload
+
+    def get_part(self, path: Union[str, Path], mimetype: str) -> MIMEBase:
+        """
+        获取已编码的附件MIME对象
+        :param path: 文件路径
+        :param mimetype: MIME类型
+        :return: MIME对象
+        """
+        path = Path(path)
+        maintype, subtype = mimetype.split("/", 1)
+        part = MIMEBase(maintype, subtype)
+        part.set_payload(self._encode(path))
+        part["Content-Transfer-Encoding"] = "base64"
+        part.add_header("Content-Disposition", "attachment", filename=path.name)
+        return part
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._cache.clear()
+            self._size = 0
+
+
+attachment_cache = AttachmentCache()
+
 
 class EmailTemplate:
     """邮件模板"""
@@ -30,7 +127,7 @@ class EmailTemplate:
         """
         try:
             html_content = render_to_string(self.template_name, self.context)
-            text_content = strip_tags(html_content)
+            text_content = _plain_text(html_content)
             return html_content, text_content
         except Exception as e:
             logger.error(f"渲染邮件模板失败: {str(e)}")
@@ -73,16 +170,7 @@ class EmailSender:
     def open(self) -> None:
         """打开连接"""
         if self._connection is None:
-            self._connection = get_connection(
-                host=self.host,
-                port=self.port,
-                username=self.username,
-                password=self.password,
-                use_tls=self.use_tls,
-                use_ssl=self.use_ssl,
-                timeout=self.timeout,
-            )
-            self._connection.open()
+            self._connection = self._new_connection()
 
     def close(self) -> None:
         """关闭连接"""
@@ -90,6 +178,77 @@ class EmailSender:
             self._connection.close()
             self._connection = None
 
+    def _new_connection(self) -> Any:
+        """新建并打开一个邮件连接"""
+        connection = get_connection(
+            host=self.host,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            use_tls=self.use_tls,
+            use_ssl=self.use_ssl,
+            timeout=self.timeout,
+        )
+        connection.open()
+        return connection
+
+    @property
+    def _pool_key(self) -> Tuple[str, int, str, str, bool, bool]:
+        # 认证信息和加密方式不同的连接不能混用
+        return self.host, self.port, self.username, self.password, self.use_tls, self.use_ssl
+
+    def _get_pool(self) -> queue.Queue:
+        """获取当前配置对应的连接池"""
+        pool = _POOL.get(self._pool_key)
+        if pool is None:
+            with _POOL_LOCK:
+                pool = _POOL.setdefault(
+                    self._pool_key,
+                    queue.Queue(maxsize=getattr(settings, "EMAIL_POOL_SIZE", 4)),
+                )
+        return pool
+
+    def _acquire_connection(self) -> Any:
+        """从连接池取出一个已打开的连接，池为空时新建"""
+        try:
+            return self._get_pool().get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _release_connection(self, connection: Any) -> None:
+        """归还连接，池已满时直接关闭"""
+        try:
+            self._get_pool().put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def _send_pooled(self, msg: EmailMessage) -> None:
+        """
+        借用连接池中的连接发送邮件
+        池中连接可能已因服务器空闲超时断开，断开时关闭并换新连接重试一次；
+        只有 SMTP 协议层面的错误（连接仍可用）才归还连接，其余情况一律丢弃
+        """
+        connection = self._acquire_connection()
+        try:
+            try:
+                msg.connection = connection
+                msg.send()
+            except smtplib.SMTPServerDisconnected:
+                connection.close()
+                connection = self._new_connection()
+                msg.connection = connection
+                msg.send()
+        except smtplib.SMTPServerDisconnected:
+            connection.close()
+            raise
+        except smtplib.SMTPException:
+            self._release_connection(connection)
+            raise
+        except Exception:
+            connection.close()
+            raise
+        self._release_connection(connection)
+
     def _create_message(
         self,
         subject: str,
@@ -100,6 +259,7 @@ class EmailSender:
         reply_to: Optional[Union[str, List[str]]] = None,
         attachments: Optional[List[Union[str, tuple]]] = None,
         html: bool = False,
+        connection: Any = None,
     ) -> EmailMessage:
         """
         创建邮件消息
@@ -111,8 +271,10 @@ class EmailSender:
         :param reply_to: 回复地址
         :param attachments: 附件列表
         :param html: 是否为HTML格式
+        :param connection: 邮件连接，默认使用当前打开的连接
         :return: 邮件消息对象
         """
+        connection = connection or self._connection
         if isinstance(to, str):
             to = [to]
         if isinstance(cc, str):
@@ -126,13 +288,13 @@ class EmailSender:
         if html:
             msg = EmailMultiAlternatives(
                 subject=subject,
-                body=strip_tags(body),
+                body=_plain_text(body),
                 from_email=formataddr((self.from_name, self.from_email)) if self.from_name else self.from_email,
                 to=to,
                 cc=cc,
                 bcc=bcc,
                 reply_to=reply_to,
-                connection=self._connection,
+                connection=connection,
             )
             msg.attach_alternative(body, "text/html")
         else:
@@ -144,7 +306,7 @@ class EmailSender:
                 cc=cc,
                 bcc=bcc,
                 reply_to=reply_to,
-                connection=self._connection,
+                connection=connection,
             )
 
         # 添加附件
@@ -153,9 +315,7 @@ class EmailSender:
                 if isinstance(attachment, str):
                     # 文件路径
                     path = Path(attachment)
-                    with open(path, "rb") as f:
-                        content = f.read()
-                        msg.attach(path.name, content, self._get_mimetype(path.suffix))
+                    msg.attach(attachment_cache.get_part(path, self._get_mimetype(path.suffix)))
                 else:
                     # (文件名, 内容, MIME类型)
                     msg.attach(*attachment)
@@ -168,19 +328,7 @@ class EmailSender:
         :param suffix: 文件后缀
         :return: MIME类型
         """
-        mimetypes = {
-            ".txt": "text/plain",
-            ".pdf": "application/pdf",
-            ".doc": "application/msword",
-            ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            ".xls": "application/vnd.ms-excel",
-            ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            ".png": "image/png",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".gif": "image/gif",
-        }
-        return mimetypes.get(suffix.lower(), "application/octet-stream")
+        return _MIMETYPES.get(suffix) or _MIMETYPES.get(suffix.lower(), "application/octet-stream")
 
     def send_mail(
         self,
@@ -218,7 +366,12 @@ class EmailSender:
                 attachments=attachments,
                 html=html,
             )
-            msg.send(fail_silently=fail_silently)
+            # 已通过 with/open() 打开连接时直接使用，否则从连接池借用；
+            # 发送时不静默，由这里统一处理 fail_silently，避免失败的连接被当作成功归还
+            if self._connection is None:
+                self._send_pooled(msg)
+            else:
+                msg.send()
             return True
         except Exception as e:
             logger.error(f"发送邮件失败: {str(e)}")
@@ -383,7 +536,7 @@ class SMTPEmailSender:
             # 添加正文
             if html:
                 msg_alt = MIMEMultipart("alternative")
-                msg_alt.attach(MIMEText(strip_tags(body), "plain", "utf-8"))
+                msg_alt.attach(MIMEText(_plain_text(body), "plain", "utf-8"))
                 msg_alt.attach(MIMEText(body, "html", "utf-8"))
                 msg.attach(msg_alt)
             else:
@@ -403,15 +556,7 @@ class SMTPEmailSender:
                 for attachment in attachments:
                     if isinstance(attachment, str):
                         # 文件路径
-                        path = Path(attachment)
-                        with open(path, "rb") as f:
-                            part = MIMEApplication(f.read())
-                            part.add_header(
-                                "Content-Disposition",
-                                "attachment",
-                                filename=path.name,
-                            )
-                            msg.attach(part)
+                        msg.attach(attachment_cache.get_part(attachment, "application/octet-stream"))
                     else:
                         # (文件名, 内容, MIME类型)
                         filename, content, mimetype = attachment
@@ -434,8 +579,22 @@ class SMTPEmailSender:
             raise
 
 
-# 创建默认邮件发送器
-email_sender = EmailSender()
+class _SenderRegistry:
+    """默认邮件发送器注册表，首次访问时才创建发送器"""
+
+    @cached_property
+    def default(self) -> EmailSender:
+        return EmailSender()
+
+
+_registry = _SenderRegistry()
+
+
+def __getattr__(name: str) -> Any:
+    # 延迟创建默认邮件发送器: from utils.other.email import email_sender
+    if name == "email_sender":
+        return _registry.default
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 """
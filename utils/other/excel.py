@@ -1,16 +1,83 @@
 import io
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Union
+import mmap
+import os
+import re
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import cached_property, lru_cache
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape as xml_escape
+from xml.sax.saxutils import quoteattr as xml_quoteattr
 
 import pandas as pd
-from django.http import HttpResponse
+import xlsxwriter
+from django.http import HttpResponse, StreamingHttpResponse
+from openpyxl import load_workbook
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils import get_column_letter
 from openpyxl.workbook.workbook import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 
 from utils.log.logger import logger
 
+try:
+    import python_calamine
+except ImportError:  # 未安装 python-calamine 时回退到 openpyxl
+    python_calamine = None
+
+# 超过该大小（字节）的文件使用 mmap 读取
+MMAP_THRESHOLD = 1 << 20
+
+# CSV 导出时每批序列化的行数
+CSV_CHUNK_SIZE = 100_000
+
+# 导出Excel时内存缓冲的上限（字节），超过后写入临时文件
+EXCEL_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# 小于该大小（字节）的导出一次性返回，不再流式传输
+EXCEL_INLINE_MAX_SIZE = 1024 * 1024
+
+# 超过该行数的导出跳过 xlsxwriter，直接生成工作表 XML
+XLSX_STREAM_ROWS = 100_000
+
+# xlsxwriter 单元格格式，与 style_excel_cell 的默认样式一致
+XLSX_DATA_FORMAT = {
+    "font_name": "微软雅黑",
+    "font_size": 11,
+    "align": "center",
+    "valign": "vcenter",
+    "text_wrap": True,
+    "border": 1,
+}
+XLSX_HEADER_FORMAT = {**XLSX_DATA_FORMAT, "bold": True, "bg_color": "#CCCCCC"}
+XLSX_DATETIME_FORMAT = {**XLSX_DATA_FORMAT, "num_format": "yyyy-mm-dd hh:mm:ss"}
+
+
+@lru_cache(maxsize=None)
+def _excel_font(font_size: int = 11, bold: bool = False, font_color: Optional[str] = None) -> Font:
+    return Font(name="微软雅黑", size=font_size, bold=bold, color=font_color)
+
+
+@lru_cache(maxsize=None)
+def _excel_alignment(align: str = "center") -> Alignment:
+    return Alignment(horizontal=align, vertical="center", wrap_text=True)
+
+
+@lru_cache(maxsize=None)
+def _excel_fill(bg_color: str) -> PatternFill:
+    return PatternFill(start_color=bg_color, end_color=bg_color, fill_type="solid")
+
+
+@lru_cache(maxsize=None)
+def _excel_border() -> Border:
+    border_style = Side(style="thin", color="000000")
+    return Border(left=border_style, right=border_style, top=border_style, bottom=border_style)
+
 
 def style_excel_cell(
     cell: Any,
@@ -22,7 +89,7 @@ def style_excel_cell(
     border: bool = True,
 ) -> None:
     """
-    设置Excel单元格样式
+    设置Excel单元格样式，样式对象在相同参数间共享
     :param cell: 单元格对象
     :param font_size: 字体大小
     :param bold: 是否加粗
@@ -32,37 +99,23 @@ def style_excel_cell(
     :param border: 是否添加边框
     """
     # 设置字体
-    cell.font = Font(
-        name="微软雅黑",
-        size=font_size,
-        bold=bold,
-        color=font_color,
-    )
+    cell.font = _excel_font(font_size, bold, font_color)
 
     # 设置对齐
-    cell.alignment = Alignment(
-        horizontal=align,
-        vertical="center",
-        wrap_text=True,
-    )
+    cell.alignment = _excel_alignment(align)
 
     # 设置背景色
     if bg_color:
-        cell.fill = PatternFill(
-            start_color=bg_color,
-            end_color=bg_color,
-            fill_type="solid",
-        )
+        cell.fill = _excel_fill(bg_color)
 
     # 设置边框
     if border:
-        border_style = Side(style="thin", color="000000")
-        cell.border = Border(
-            left=border_style,
-            right=border_style,
-            top=border_style,
-            bottom=border_style,
-        )
+        cell.border = _excel_border()
+
+
+def _column_width(max_length: int, min_width: int = 10, max_width: int = 50) -> float:
+    """根据内容长度计算列宽"""
+    return max(min((max_length + 2) * 1.2, max_width), min_width)
 
 
 def auto_adjust_columns(worksheet: Worksheet, min_width: int = 10, max_width: int = 50) -> None:
@@ -83,11 +136,38 @@ def auto_adjust_columns(worksheet: Worksheet, min_width: int = 10, max_width: in
             except:
                 pass
 
-        adjusted_width = (max_length + 2) * 1.2
-        worksheet.column_dimensions[column_letter].width = max(
-            min(adjusted_width, max_width),
-            min_width,
-        )
+        worksheet.column_dimensions[column_letter].width = _column_width(max_length, min_width, max_width)
+
+
+def _styled_cell(worksheet: Any, value: Any, header: bool = False) -> WriteOnlyCell:
+    """创建只写模式下带样式的单元格"""
+    cell = WriteOnlyCell(worksheet, value=value)
+    if header:
+        style_excel_cell(cell, bold=True, bg_color="CCCCCC")
+    else:
+        style_excel_cell(cell)
+    return cell
+
+
+@lru_cache(maxsize=64)
+def _row_getter(keys: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Tuple[Any, ...]]:
+    """
+    按表头生成取行函数，相同表头复用
+    字段齐全时由 itemgetter 在 C 层一次取出整行，缺字段时逐个 get 补 None
+    :param keys: 字段元组
+    :return: 取行函数
+    """
+    getter = itemgetter(*keys)
+    single = len(keys) == 1
+
+    def get_row(item: Dict[str, Any]) -> Tuple[Any, ...]:
+        try:
+            values = getter(item)
+        except KeyError:
+            return tuple(item.get(key) for key in keys)
+        return (values,) if single else values
+
+    return get_row
 
 
 def create_excel_workbook(
@@ -96,65 +176,193 @@ def create_excel_workbook(
     sheet_name: str = "Sheet1",
 ) -> Workbook:
     """
-    创建Excel工作簿
+    创建Excel工作簿（只写模式，逐行写入，返回的工作簿只能保存一次）
     :param data: 数据列表
     :param headers: 表头映射
     :param sheet_name: 工作表名称
     :return: 工作簿对象
     """
-    workbook = Workbook()
-    worksheet = workbook.active
-    worksheet.title = sheet_name
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
 
     # 如果没有提供表头映射，使用数据的键作为表头
     if not headers and data:
         headers = {key: key for key in data[0].keys()}
 
-    # 写入表头
     if headers:
-        for col, header in enumerate(headers.values(), 1):
-            cell = worksheet.cell(row=1, column=col, value=header)
-            style_excel_cell(cell, bold=True, bg_color="CCCCCC")
+        # 每行只取一次值，列宽计算与写入共用
+        get_row = _row_getter(tuple(headers.keys()))
+        rows = [get_row(item) for item in data]
+
+        # 只写模式下列宽必须在写入行之前设置
+        lengths = [len(str(header)) for header in headers.values()]
+        for row in rows:
+            for col, value in enumerate(row):
+                if value is not None:
+                    lengths[col] = max(lengths[col], len(str(value)))
+        for col, length in enumerate(lengths, 1):
+            worksheet.column_dimensions[get_column_letter(col)].width = _column_width(length)
+
+        # 写入表头
+        worksheet.append([_styled_cell(worksheet, header, header=True) for header in headers.values()])
 
         # 写入数据
-        for row, item in enumerate(data, 2):
-            for col, key in enumerate(headers.keys(), 1):
-                cell = worksheet.cell(row=row, column=col, value=item.get(key))
-                style_excel_cell(cell)
-
-    # 调整列宽
-    auto_adjust_columns(worksheet)
+        for row in rows:
+            worksheet.append([_styled_cell(worksheet, value) for value in row])
 
     return workbook
 
 
+class _MmapFile(io.RawIOBase):
+    """
+    mmap 的只读文件对象包装
+    Python 3.13 之前 mmap 没有 seekable()，openpyxl(zipfile) 不能直接读取
+    """
+
+    def __init__(self, mm: mmap.mmap) -> None:
+        super().__init__()
+        self._mm = mm
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._mm.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._mm.seek(offset, whence)
+        return self._mm.tell()
+
+    def tell(self) -> int:
+        return self._mm.tell()
+
+
+@contextmanager
+def _open_excel(file_path: Any) -> Iterator[Any]:
+    """
+    打开Excel源文件，大文件映射为只读 mmap，其余情况原样返回
+    :param file_path: 文件路径或文件对象
+    :return: 文件路径或 mmap 对象
+    """
+    if not isinstance(file_path, (str, os.PathLike)) or os.path.getsize(file_path) <= MMAP_THRESHOLD:
+        yield file_path
+        return
+
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        yield mm
+
+
+def _read_excel(io_: Any, **kwargs: Any) -> Any:
+    """
+    读取Excel，优先使用 calamine 引擎，失败时回退到 openpyxl
+    :param io_: 文件路径或文件对象
+    :param kwargs: 透传给 pd.read_excel 的参数
+    :return: DataFrame对象或 {sheet: DataFrame}
+    """
+    if python_calamine is not None:
+        try:
+            return pd.read_excel(io_, engine="calamine", **kwargs)
+        except Exception as e:
+            logger.warning(f"calamine 读取Excel失败，回退到 openpyxl: {str(e)}")
+            if hasattr(io_, "seek"):
+                io_.seek(0)
+    if isinstance(io_, mmap.mmap):
+        io_ = _MmapFile(io_)
+    return pd.read_excel(io_, engine="openpyxl", **kwargs)
+
+
+def _read_excel_headers(file_path: str, sheet_name: Optional[Union[str, int]] = 0) -> List[Any]:
+    """
+    只读取Excel表头行
+    :param file_path: 文件路径
+    :param sheet_name: 工作表名称或索引
+    :return: 表头列表
+    """
+    # 与 pandas_read_excel 使用相同的表头解析规则（不跳过开头的空行空列，空表头为 Unnamed: n），
+    # 保证模板校验与实际导入读到的列一致；nrows=0 时 calamine 只解析表头行
+    with _open_excel(file_path) as source:
+        return _read_excel(source, sheet_name=sheet_name, nrows=0).columns.tolist()
+
+
+def _list_sheet_names(file_path: str) -> List[str]:
+    """
+    获取工作簿中的全部工作表名称
+    :param file_path: 文件路径
+    :return: 工作表名称列表
+    """
+    if python_calamine is not None:
+        try:
+            return list(python_calamine.CalamineWorkbook.from_path(file_path).sheet_names)
+        except Exception as e:
+            logger.warning(f"calamine 读取工作表名称失败，回退到 openpyxl: {str(e)}")
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def _read_excel_sheets(file_path: str, sheet_names: List[Union[str, int]], **kwargs: Any) -> Dict[Any, pd.DataFrame]:
+    """
+    多线程并行读取多个工作表，每个线程独立打开文件
+    :param file_path: 文件路径
+    :param sheet_names: 工作表名称或索引列表
+    :param kwargs: 透传给 pd.read_excel 的参数
+    :return: {工作表: DataFrame}
+    """
+
+    def read_sheet(name: Union[str, int]) -> pd.DataFrame:
+        return _read_excel(file_path, sheet_name=name, **kwargs)
+
+    max_workers = min(len(sheet_names), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(sheet_names, executor.map(read_sheet, sheet_names)))
+
+
 def pandas_read_excel(
     file_path: str,
-    sheet_name: Optional[Union[str, int]] = 0,
+    sheet_name: Optional[Union[str, int, List[Union[str, int]]]] = 0,
     header: Optional[Union[int, List[int]]] = 0,
     names: Optional[List[str]] = None,
     skiprows: Optional[Union[int, List[int]]] = None,
     na_values: Optional[List[str]] = None,
+    dtype: Optional[Union[str, Dict[str, Any]]] = None,
+    na_filter: bool = True,
 ) -> pd.DataFrame:
     """
     使用pandas读取Excel文件
     :param file_path: 文件路径
-    :param sheet_name: 工作表名称或索引
+    :param sheet_name: 工作表名称或索引，None 或列表时读取多个工作表
     :param header: 表头行号
     :param names: 列名列表
     :param skiprows: 跳过的行号
     :param na_values: 空值替换列表
-    :return: DataFrame对象
+    :param dtype: 列类型，指定后跳过 pandas 的类型推断
+    :param na_filter: 是否检测空值，不需要时传 False 可省去一次逐列扫描
+    :return: DataFrame对象，读取多个工作表时为 {工作表: DataFrame}
     """
+    kwargs = dict(
+        header=header,
+        names=names,
+        skiprows=skiprows,
+        na_values=na_values or ["", "NA", "N/A", "null", "NULL", "none", "None"],
+        dtype=dtype,
+        na_filter=na_filter,
+    )
     try:
-        df = pd.read_excel(
-            file_path,
-            sheet_name=sheet_name,
-            header=header,
-            names=names,
-            skiprows=skiprows,
-            na_values=na_values or ["", "NA", "N/A", "null", "NULL", "none", "None"],
-        )
+        # 多个工作表: 并行读取
+        if (sheet_name is None or isinstance(sheet_name, list)) and isinstance(file_path, (str, os.PathLike)):
+            sheet_names = _list_sheet_names(file_path) if sheet_name is None else sheet_name
+            if len(sheet_names) > 1:
+                return _read_excel_sheets(file_path, sheet_names, **kwargs)
+
+        with _open_excel(file_path) as source:
+            df = _read_excel(source, sheet_name=sheet_name, **kwargs)
         return df
     except Exception as e:
         logger.error(f"读取Excel文件失败: {str(e)}")
@@ -167,7 +375,6 @@ def pandas_write_excel(
     sheet_name: str = "Sheet1",
     index: bool = False,
     header: bool = True,
-    encoding: str = "utf-8",
 ) -> None:
     """
     使用pandas写入Excel文件
@@ -176,34 +383,312 @@ def pandas_write_excel(
     :param sheet_name: 工作表名称
     :param index: 是否包含索引
     :param header: 是否包含表头
-    :param encoding: 编码格式
     """
     try:
+        # 关闭 xlsxwriter 的字符串自动识别URL，避免逐单元格正则匹配
         df.to_excel(
             file_path,
             sheet_name=sheet_name,
             index=index,
             header=header,
-            encoding=encoding,
+            engine="xlsxwriter",
+            engine_kwargs={"options": {"strings_to_urls": False}},
         )
     except Exception as e:
         logger.error(f"写入Excel文件失败: {str(e)}")
         raise
 
 
+def _iter_file(file_obj: Any, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """分块读取文件，读取完毕后关闭"""
+    try:
+        while True:
+            chunk = file_obj.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        file_obj.close()
+
+
+def _column_values(series: pd.Series) -> List[Any]:
+    """按列转换为Python对象列表，空值（NaN、NaT、NA）统一为 None"""
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def _column_writer(worksheet: Any, dtype: Any) -> Any:
+    """按列的数据类型选择单元格写入方法，避免逐单元格类型判断"""
+    if pd.api.types.is_bool_dtype(dtype):
+        return worksheet.write_boolean
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_float_dtype(dtype):
+        return worksheet.write_number
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return worksheet.write_datetime
+
+    def write(row: int, col: int, value: Any, cell_format: Any) -> int:
+        # 与 DataFrame.to_excel 一致，不支持的类型（字典、列表等）按字符串写入
+        try:
+            return worksheet.write(row, col, value, cell_format)
+        except TypeError:
+            return worksheet.write_string(row, col, str(value), cell_format)
+
+    return write
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    "</Types>"
+)
+_XLSX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name={sheet_name} sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    "</Relationships>"
+)
+# 样式索引: 0 默认、1 数据、2 表头、3 日期时间，与 XLSX_*_FORMAT 一致
+_XLSX_ALIGNMENT = '<alignment horizontal="center" vertical="center" wrapText="1"/>'
+_XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm:ss"/></numFmts>'
+    '<fonts count="2">'
+    '<font><sz val="11"/><name val="微软雅黑"/></font>'
+    '<font><b/><sz val="11"/><name val="微软雅黑"/></font>'
+    "</fonts>"
+    '<fills count="3">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFCCCCCC"/><bgColor indexed="64"/></patternFill></fill>'
+    "</fills>"
+    '<borders count="2">'
+    "<border><left/><right/><top/><bottom/><diagonal/></border>"
+    '<border><left style="thin"><color rgb="FF000000"/></left><right style="thin"><color rgb="FF000000"/></right>'
+    '<top style="thin"><color rgb="FF000000"/></top><bottom style="thin"><color rgb="FF000000"/></bottom>'
+    "<diagonal/></border>"
+    "</borders>"
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="1" xfId="0" applyFont="1" applyBorder="1" applyAlignment="1">'
+    f"{_XLSX_ALIGNMENT}</xf>"
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="1" xfId="0" applyFont="1" applyFill="1" applyBorder="1" '
+    f'applyAlignment="1">{_XLSX_ALIGNMENT}</xf>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="1" xfId="0" applyNumberFormat="1" applyFont="1" '
+    f'applyBorder="1" applyAlignment="1">{_XLSX_ALIGNMENT}</xf>'
+    "</cellXfs>"
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    "</styleSheet>"
+)
+_XLSX_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+)
+_XLSX_EPOCH = datetime(1899, 12, 30)
+# XML 1.0 不允许的控制字符
+_XML_ILLEGAL_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _xml_string_cell(value: Any, style: int = 1) -> str:
+    text = _XML_ILLEGAL_CHARS.sub("", xml_escape(str(value)))
+    return f'<c s="{style}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xml_number_cell(value: Any) -> str:
+    if value != value or value in (float("inf"), float("-inf")):
+        return '<c s="1"/>'
+    return f'<c s="1"><v>{value!r}</v></c>'
+
+
+def _xml_bool_cell(value: bool) -> str:
+    return f'<c s="1" t="b"><v>{int(value)}</v></c>'
+
+
+def _xml_datetime_cell(value: Any) -> str:
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    serial = (value.replace(tzinfo=None) - _XLSX_EPOCH).total_seconds() / 86400
+    return f'<c s="3"><v>{serial!r}</v></c>'
+
+
+# 按值类型选择单元格编码函数
+_XML_CELL_ENCODERS = {
+    str: _xml_string_cell,
+    int: _xml_number_cell,
+    float: _xml_number_cell,
+    bool: _xml_bool_cell,
+    datetime: _xml_datetime_cell,
+    date: _xml_datetime_cell,
+    pd.Timestamp: _xml_datetime_cell,
+}
+
+
+def _xml_cell(value: Any) -> str:
+    if value is None:
+        return '<c s="1"/>'
+    encoder = _XML_CELL_ENCODERS.get(type(value))
+    if encoder is None:
+        if isinstance(value, bool):
+            encoder = _xml_bool_cell
+        elif isinstance(value, (int, float)):
+            encoder = _xml_number_cell
+        elif isinstance(value, (datetime, date)):
+            encoder = _xml_datetime_cell
+        else:
+            encoder = _xml_string_cell
+    return encoder(value)
+
+
+def stream_xlsx(
+    output: Any,
+    headers: List[str],
+    rows: Iterable[Iterable[Any]],
+    sheet_name: str = "Sheet1",
+    widths: Optional[List[float]] = None,
+    batch_size: int = 1000,
+) -> None:
+    """
+    直接生成工作表 XML 并流式写入 zip，适用于大数据量导出
+    :param output: 输出文件对象
+    :param headers: 表头列表
+    :param rows: 数据行迭代器
+    :param sheet_name: 工作表名称
+    :param widths: 列宽列表
+    :param batch_size: 每批写入的行数
+    """
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+        zf.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _XLSX_RELS)
+        zf.writestr("xl/workbook.xml", _XLSX_WORKBOOK.format(sheet_name=xml_quoteattr(sheet_name)))
+        zf.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+        zf.writestr("xl/styles.xml", _XLSX_STYLES)
+
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(_XLSX_SHEET_HEAD.encode())
+            if widths:
+                cols = "".join(
+                    f'<col min="{col}" max="{col}" width="{width}" customWidth="1"/>'
+                    for col, width in enumerate(widths, 1)
+                )
+                sheet.write(f"<cols>{cols}</cols>".encode())
+
+            sheet.write(b"<sheetData>")
+            header_cells = "".join(_xml_string_cell(header, style=2) for header in headers)
+            buffer = [f'<row r="1">{header_cells}</row>']
+            for row_num, row in enumerate(rows, 2):
+                buffer.append(f'<row r="{row_num}">{"".join(map(_xml_cell, row))}</row>')
+                if len(buffer) >= batch_size:
+                    sheet.write("".join(buffer).encode())
+                    buffer.clear()
+            sheet.write("".join(buffer).encode())
+            sheet.write(b"</sheetData></worksheet>")
+
+
+def _write_styled_excel(output: Any, df: pd.DataFrame, sheet_name: str = "Sheet1", index: bool = False) -> None:
+    """
+    将DataFrame写入带样式的Excel，逐行写入；超过 XLSX_STREAM_ROWS 行时直接生成 XML
+    :param output: 输出文件对象
+    :param df: DataFrame对象
+    :param sheet_name: 工作表名称
+    :param index: 是否包含索引
+    """
+    headers = [str(header) for header in df.columns]
+    if index:
+        # 与 DataFrame.to_excel 一致，未命名的索引列表头为空
+        headers = [*(str(name) if name is not None else "" for name in df.index.names), *headers]
+        df = df.reset_index()
+
+    # 写入前计算列宽
+    widths = []
+    for col, header in enumerate(headers):
+        length = len(header)
+        if len(df):
+            # pandas 3 中 astype(str) 保留缺失值为 NaN，全空列的长度按 0 计
+            length = max(length, int(df.iloc[:, col].astype(str).str.len().fillna(0).max()))
+        widths.append(_column_width(length))
+
+    # 按列预处理数据
+    columns = [_column_values(df.iloc[:, col]) for col in range(df.shape[1])]
+
+    if len(df) > XLSX_STREAM_ROWS:
+        stream_xlsx(output, headers, zip(*columns), sheet_name=sheet_name, widths=widths)
+        return
+
+    workbook = xlsxwriter.Workbook(
+        output,
+        {"constant_memory": True, "strings_to_urls": False, "remove_timezone": True},
+    )
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+
+        # 格式只注册一次，所有单元格共享
+        header_format = workbook.add_format(XLSX_HEADER_FORMAT)
+        data_format = workbook.add_format(XLSX_DATA_FORMAT)
+        datetime_format = workbook.add_format(XLSX_DATETIME_FORMAT)
+        formats = [
+            datetime_format if pd.api.types.is_datetime64_any_dtype(dtype) else data_format for dtype in df.dtypes
+        ]
+
+        # 常量内存模式下需在写入前设置列宽
+        for col, width in enumerate(widths):
+            worksheet.set_column(col, col, width)
+
+        # 写入表头
+        worksheet.write_row(0, 0, headers, header_format)
+
+        # 逐行写入
+        writers = [_column_writer(worksheet, dtype) for dtype in df.dtypes]
+        for row_num, row in enumerate(zip(*columns), 1):
+            for col, value in enumerate(row):
+                if value is None:
+                    worksheet.write_blank(row_num, col, None, formats[col])
+                else:
+                    writers[col](row_num, col, value, formats[col])
+    finally:
+        workbook.close()
+
+
 def pandas_download_excel(
     data: Union[pd.DataFrame, List[Dict[str, Any]]],
     filename: Optional[str] = None,
     sheet_name: str = "Sheet1",
     index: bool = False,
-) -> HttpResponse:
+) -> Union[HttpResponse, StreamingHttpResponse]:
     """
     下载Excel文件
     :param data: DataFrame对象或数据列表
     :param filename: 文件名
     :param sheet_name: 工作表名称
     :param index: 是否包含索引
-    :return: HTTP响应对象
+    :return: HTTP响应对象，较大的文件为流式响应
     """
     try:
         # 如果是数据列表，转换为DataFrame
@@ -212,36 +697,29 @@ def pandas_download_excel(
         else:
             df = data
 
-        # 创建一个字节流
-        output = io.BytesIO()
-
-        # 写入Excel
-        with pd.ExcelWriter(output, engine="openpyxl") as writer:
-            df.to_excel(writer, sheet_name=sheet_name, index=index)
-
-            # 获取工作表
-            worksheet = writer.sheets[sheet_name]
-
-            # 设置样式
-            for row in worksheet.iter_rows(min_row=1, max_row=1):
-                for cell in row:
-                    style_excel_cell(cell, bold=True, bg_color="CCCCCC")
-
-            for row in worksheet.iter_rows(min_row=2):
-                for cell in row:
-                    style_excel_cell(cell)
-
-            # 调整列宽
-            auto_adjust_columns(worksheet)
+        # 写入Excel，超过 EXCEL_SPOOL_MAX_SIZE 时落盘到临时文件
+        output = tempfile.SpooledTemporaryFile(max_size=EXCEL_SPOOL_MAX_SIZE)
+        try:
+            _write_styled_excel(output, df, sheet_name=sheet_name, index=index)
+            size = output.seek(0, io.SEEK_END)
+            output.seek(0)
+        except Exception:
+            output.close()
+            raise
 
         # 设置响应头
         if not filename:
             filename = f"export_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx"
 
-        response = HttpResponse(
-            output.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
+        content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        if size <= EXCEL_INLINE_MAX_SIZE:
+            # 小文件读出一次后立即释放缓冲区，直接作为响应内容
+            with output:
+                content = output.read()
+            response = HttpResponse(content, content_type=content_type)
+        else:
+            response = StreamingHttpResponse(_iter_file(output), content_type=content_type)
+            response["Content-Length"] = str(size)
         response["Content-Disposition"] = f'attachment; filename="{filename}"'
         return response
 
@@ -250,6 +728,60 @@ def pandas_download_excel(
         raise
 
 
+def pandas_download(
+    data: Union[pd.DataFrame, List[Dict[str, Any]]],
+    filename: Optional[str] = None,
+    format: str = "auto",
+    request: Any = None,
+    sheet_name: str = "Sheet1",
+    index: bool = False,
+) -> Union[HttpResponse, StreamingHttpResponse]:
+    """
+    下载表格文件，客户端接受 text/csv 时流式输出CSV，否则输出Excel
+    :param data: DataFrame对象或数据列表
+    :param filename: 文件名
+    :param format: 导出格式: auto、csv、xlsx
+    :param request: 请求对象，format=auto 时根据 Accept 头协商格式
+    :param sheet_name: 工作表名称
+    :param index: 是否包含索引
+    :return: HTTP响应对象
+    """
+    accepts_csv = request is not None and "text/csv" in request.META.get("HTTP_ACCEPT", "")
+    if format == "csv" or (format == "auto" and accepts_csv):
+        return pandas_download_csv(data, filename=filename, index=index)
+    return pandas_download_excel(data, filename=filename, sheet_name=sheet_name, index=index)
+
+
+def pandas_download_csv(
+    data: Union[pd.DataFrame, List[Dict[str, Any]]],
+    filename: Optional[str] = None,
+    index: bool = False,
+) -> StreamingHttpResponse:
+    """
+    流式下载CSV文件
+    :param data: DataFrame对象或数据列表
+    :param filename: 文件名
+    :param index: 是否包含索引
+    :return: 流式HTTP响应对象
+    """
+    df = pd.DataFrame(data) if isinstance(data, list) else data
+
+    def csv_iterator() -> Iterator[str]:
+        # 带 BOM，Excel 打开中文不乱码
+        yield "\ufeff"
+        for start in range(0, max(len(df), 1), CSV_CHUNK_SIZE):
+            yield df.iloc[start : start + CSV_CHUNK_SIZE].to_csv(index=index, header=start == 0)
+
+    if not filename:
+        filename = f"export_{datetime.now().strftime('%Y%m%d%H%M%S')}.csv"
+    elif filename.endswith((".xlsx", ".xls")):
+        filename = f"{os.path.splitext(filename)[0]}.csv"
+
+    response = StreamingHttpResponse(csv_iterator(), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
 def validate_excel_template(
     file_path: str,
     required_headers: List[str],
@@ -263,9 +795,8 @@ def validate_excel_template(
     :return: (是否有效, 错误信息)
     """
     try:
-        # 读取Excel文件
-        df = pd.read_excel(file_path, sheet_name=sheet_name, nrows=0)
-        headers = df.columns.tolist()
+        # 只读取表头行
+        headers = _read_excel_headers(file_path, sheet_name)
 
         # 检查必需的表头
         missing_headers = [header for header in required_headers if header not in headers]
@@ -279,58 +810,108 @@ def validate_excel_template(
         return False, f"验证Excel模板失败: {str(e)}"
 
 
+class ValidationResult:
+    """Excel数据处理结果，数据保持列式存储，按需转换为字典列表"""
+
+    def __init__(self, valid_df: pd.DataFrame, invalid_df: pd.DataFrame, errors: pd.Series):
+        self.valid_df = valid_df
+        self.invalid_df = invalid_df
+        self.errors = errors
+
+    @cached_property
+    def valid_data(self) -> List[Dict[str, Any]]:
+        """有效数据列表"""
+        return self.valid_df.to_dict("records")
+
+    @cached_property
+    def invalid_data(self) -> List[Dict[str, Any]]:
+        """无效数据列表，每行附带 errors 字段"""
+        records = self.invalid_df.to_dict("records")
+        for record, row_errors in zip(records, self.errors.tolist()):
+            record["errors"] = row_errors
+        return records
+
+    def as_dicts(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        转换为字典列表
+        :return: (有效数据列表, 无效数据列表)
+        """
+        return self.valid_data, self.invalid_data
+
+    def __iter__(self) -> Iterator[List[Dict[str, Any]]]:
+        # 兼容 valid_data, invalid_data = process_excel_data(...) 的写法
+        return iter(self.as_dicts())
+
+
 def process_excel_data(
     df: pd.DataFrame,
     column_mapping: Optional[Dict[str, str]] = None,
     converters: Optional[Dict[str, callable]] = None,
     validators: Optional[Dict[str, callable]] = None,
-) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+) -> ValidationResult:
     """
     处理Excel数据
     :param df: DataFrame对象
     :param column_mapping: 列名映射
     :param converters: 数据转换器
     :param validators: 数据验证器
-    :return: (有效数据列表, 无效数据列表)
+    :return: 处理结果，可解包为 (有效数据列表, 无效数据列表)
     """
-    valid_data = []
-    invalid_data = []
-
     try:
         # 重命名列
         if column_mapping:
             df = df.rename(columns=column_mapping)
-
-        # 处理每一行数据
-        for index, row in df.iterrows():
-            row_data = row.to_dict()
-            row_errors = []
-
-            # 数据转换
-            if converters:
-                for field, converter in converters.items():
+        else:
+            df = df.copy()
+
+        # 缺失的转换字段补为空列，与逐行 row_data.get(field) 的语义一致
+        for field in converters or {}:
+            if field not in df.columns:
+                df[field] = None
+
+        # 预先计算字段的列序号，循环内只做元组下标访问
+        conv_list = [(df.columns.get_loc(field), field, converter) for field, converter in (converters or {}).items()]
+        valid_list = [
+            (df.columns.get_loc(field) if field in df.columns else None, field, validator)
+            for field, validator in (validators or {}).items()
+        ]
+        converted: Dict[int, List[Any]] = {idx: [] for idx, _, _ in conv_list}
+        row_errors: List[List[str]] = []
+
+        for values in df.itertuples(index=False, name=None):
+            current_errors = []
+
+            # 数据转换，转换失败时保留原值
+            if conv_list:
+                values = list(values)
+                for idx, field, converter in conv_list:
                     try:
-                        row_data[field] = converter(row_data.get(field))
+                        values[idx] = converter(values[idx])
                     except Exception as e:
-                        row_errors.append(f"{field}: {str(e)}")
+                        current_errors.append(f"{field}: {str(e)}")
+                    converted[idx].append(values[idx])
 
             # 数据验证
-            if validators:
-                for field, validator in validators.items():
-                    try:
-                        if not validator(row_data.get(field)):
-                            row_errors.append(f"{field}: 验证失败")
-                    except Exception as e:
-                        row_errors.append(f"{field}: {str(e)}")
-
-            # 根据验证结果分类
-            if row_errors:
-                row_data["errors"] = row_errors
-                invalid_data.append(row_data)
-            else:
-                valid_data.append(row_data)
-
-        return valid_data, invalid_data
+            for idx, field, validator in valid_list:
+                try:
+                    if not validator(values[idx] if idx is not None else None):
+                        current_errors.append(f"{field}: 验证失败")
+                except Exception as e:
+                    current_errors.append(f"{field}: {str(e)}")
+
+            row_errors.append(current_errors)
+
+        for idx, column in converted.items():
+            df.isetitem(idx, column)
+
+        # 根据验证结果分类
+        errors = pd.Series(row_errors, index=df.index, dtype=object)
+        invalid_mask = errors.map(bool)
+        return ValidationResult(
+            valid_df=df[~invalid_mask],
+            invalid_df=df[invalid_mask],
+            errors=errors[invalid_mask],
+        )
 
     except Exception as e:
         logger.error(f"处理Excel数据失败: {str(e)}")
@@ -360,6 +941,9 @@ print(df)
 # 下载Excel
 response = pandas_download_excel(data, "example.xlsx")
 
+# 根据 Accept 头下载CSV或Excel
+response = pandas_download(data, "example.xlsx", request=request)
+
 # 验证Excel模板
 valid, error = validate_excel_template(
     "template.xlsx",
@@ -384,4 +968,9 @@ valid_data, invalid_data = process_excel_data(
     converters,
     validators
 )
+
+# 大数据量时直接使用列式结果，避免逐行构造字典
+result = process_excel_data(df, column_mapping, converters, validators)
+for item in result.valid_df.itertuples(index=False):
+    print(item.name, item.age)
 """
@@ -2,21 +2,72 @@ import hashlib
 import mimetypes
 import os
 import shutil
+import tempfile
 import uuid
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple, Union
 
 from django.conf import settings
 from django.core.files import File
-from django.core.files.storage import Storage, default_storage
+from django.core.files.storage import FileSystemStorage, Storage, default_storage
 from django.core.files.uploadedfile import UploadedFile
-from django.http import FileResponse, StreamingHttpResponse
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.utils.encoding import escape_uri_path
 
 from utils.log.logger import logger
 
 
+# 已压缩的文件格式，打包时不再 deflate
+COMPRESSED_EXTENSIONS = frozenset(
+    {
+        ".jpg", ".jpeg", ".png", ".gif", ".webp",
+        ".mp3", ".mp4", ".avi", ".mov", ".mkv",
+        ".zip", ".rar", ".7z", ".gz", ".bz2", ".xz",
+        ".docx", ".xlsx", ".pptx", ".pdf",
+    }
+)
+
+# 文件复制缓冲区大小
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# 打包时内存缓冲的上限（字节），超过后写入临时文件
+ZIP_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# 解压文件的最大线程数
+EXTRACT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# 导入时初始化 MIME 类型表，避免首次并发请求时的懒加载
+mimetypes.init()
+
+
+@lru_cache(maxsize=256)
+def _ctype(ext: str) -> Optional[str]:
+    """
+    按扩展名获取内容类型，结果缓存复用
+    :param ext: 小写扩展名，如 .pdf
+    :return: 内容类型，未知时返回 None
+    """
+    return mimetypes.guess_type(f"x{ext}")[0]
+
+
+def _open_file(storage: Storage, file_path: str, mode: str = "rb") -> File:
+    """
+    打开存储中的文件，不存在时抛出 FileNotFoundError
+    直接打开而不先调用 exists()，远程存储可少一次请求
+    :param storage: 存储对象
+    :param file_path: 文件路径
+    :param mode: 打开模式
+    :return: 文件对象
+    """
+    try:
+        return storage.open(file_path, mode)
+    except (FileNotFoundError, OSError) as e:
+        raise FileNotFoundError(f"文件不存在: {file_path}") from e
+
+
 class FileHandler:
     """文件处理器"""
 
@@ -29,7 +80,8 @@ class FileHandler:
     ):
         self.storage = storage or default_storage
         self.base_dir = base_dir or getattr(settings, "MEDIA_ROOT", "media")
-        self.allowed_extensions = allowed_extensions
+        # 统一转为小写集合，校验时 O(1) 查找
+        self.allowed_extensions = frozenset(e.lower() for e in allowed_extensions) if allowed_extensions else None
         self.max_size = max_size or getattr(settings, "MAX_UPLOAD_SIZE", 10 * 1024 * 1024)  # 默认10MB
 
     def save_file(
@@ -69,14 +121,21 @@ class FileHandler:
     def delete_file(self, file_path: str) -> bool:
         """
         删除文件
+        本地存储文件不存在时返回 False；其他存储后端删除不存在的文件不会报错，此时同样返回 True
         :param file_path: 文件路径
         :return: 是否成功
         """
         try:
-            if self.storage.exists(file_path):
-                self.storage.delete(file_path)
+            if isinstance(self.storage, FileSystemStorage):
+                # 直接删除，由 FileNotFoundError 判断文件是否存在，省去一次 exists 调用
+                try:
+                    os.remove(self.storage.path(file_path))
+                except FileNotFoundError:
+                    return False
                 return True
-            return False
+
+            self.storage.delete(file_path)
+            return True
         except Exception as e:
             logger.error(f"删除文件失败: {str(e)}")
             return False
@@ -107,7 +166,7 @@ class FileHandler:
                 "size": stat.st_size,
                 "created_time": datetime.fromtimestamp(stat.st_ctime),
                 "modified_time": datetime.fromtimestamp(stat.st_mtime),
-                "content_type": mimetypes.guess_type(file_path)[0],
+                "content_type": _ctype(self._get_file_extension(file_path)),
             }
         except Exception as e:
             logger.error(f"获取文件信息失败: {str(e)}")
@@ -162,7 +221,10 @@ class FileHandler:
         :param filename: 文件名
         :return: 扩展名
         """
-        return os.path.splitext(filename)[1].lower()
+        # 与 os.path.splitext 一致：只看文件名部分，忽略开头的点
+        base = filename.rpartition("/")[2].rpartition("\\")[2]
+        stem, _, ext = base.rpartition(".")
+        return f".{ext.lower()}" if stem.strip(".") else ""
 
 
 class FileDownloader:
@@ -178,7 +240,7 @@ class FileDownloader:
         content_type: Optional[str] = None,
         as_attachment: bool = True,
         chunk_size: int = 8192,
-    ) -> Union[FileResponse, StreamingHttpResponse]:
+    ) -> Union[FileResponse, StreamingHttpResponse, HttpResponse]:
         """
         下载文件
         :param file_path: 文件路径
@@ -189,20 +251,22 @@ class FileDownloader:
         :return: 响应对象
         """
         try:
-            # 检查文件是否存在
-            if not self.storage.exists(file_path):
-                raise FileNotFoundError(f"文件不存在: {file_path}")
-
             # 获取文件名
             if not filename:
                 filename = os.path.basename(file_path)
 
             # 获取内容类型
             if not content_type:
-                content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                content_type = _ctype(FileHandler._get_file_extension(filename)) or "application/octet-stream"
 
-            # 打开文件
-            file = self.storage.open(file_path)
+            # 交由反向代理或对象存储发送文件
+            if getattr(settings, "USE_SENDFILE", False):
+                response = self._offload_response(file_path, filename, content_type, as_attachment)
+                if response is not None:
+                    return response
+
+            # 打开文件，不存在时抛出 FileNotFoundError
+            file = _open_file(self.storage, file_path)
 
             # 创建响应
             response = FileResponse(
@@ -226,12 +290,63 @@ class FileDownloader:
             logger.error(f"下载文件失败: {str(e)}")
             raise
 
+    def _offload_response(
+        self,
+        file_path: str,
+        filename: str,
+        content_type: str,
+        as_attachment: bool,
+    ) -> Optional[HttpResponse]:
+        """
+        构造不经过 Django 传输文件内容的响应
+        本地存储返回 X-Accel-Redirect / X-Sendfile 头，由反向代理通过 sendfile 发送
+        远程存储重定向到带有效期的下载地址
+        :param file_path: 文件路径
+        :param filename: 下载文件名
+        :param content_type: 内容类型
+        :param as_attachment: 是否作为附件下载
+        :return: 响应对象，存储不支持时返回 None
+        """
+        disposition = "attachment" if as_attachment else "inline"
+        content_disposition = f'{disposition}; filename="{escape_uri_path(filename)}"'
+
+        if isinstance(self.storage, FileSystemStorage):
+            full_path = self.storage.path(file_path)
+            if not os.path.isfile(full_path):
+                raise FileNotFoundError(f"文件不存在: {file_path}")
+
+            header = getattr(settings, "SENDFILE_HEADER", "X-Accel-Redirect")
+            response = HttpResponse(content_type=content_type)
+            if header == "X-Accel-Redirect":
+                location = getattr(settings, "SENDFILE_URL", "/protected/").rstrip("/")
+                response[header] = escape_uri_path(f"{location}/{file_path.replace(os.sep, '/').lstrip('/')}")
+            else:
+                response[header] = full_path
+
+            response["Content-Disposition"] = content_disposition
+            return response
+
+        # 远程存储（如 S3）生成带有效期的地址，并由对象存储按参数返回文件名和内容类型；
+        # 不支持这些参数的存储回退到常规下载，避免下载文件名变成存储键
+        try:
+            url = self.storage.url(
+                file_path,
+                parameters={
+                    "ResponseContentDisposition": content_disposition,
+                    "ResponseContentType": content_type,
+                },
+                expire=getattr(settings, "SENDFILE_URL_EXPIRE", 300),
+            )
+        except (TypeError, NotImplementedError):
+            return None
+        return HttpResponseRedirect(url)
+
     def stream_file(
         self,
         file_path: str,
         filename: Optional[str] = None,
         content_type: Optional[str] = None,
-        chunk_size: int = 8192,
+        chunk_size: int = 256 * 1024,
     ) -> StreamingHttpResponse:
         """
         流式下载文件
@@ -242,34 +357,20 @@ class FileDownloader:
         :return: 响应对象
         """
         try:
-            # 检查文件是否存在
-            if not self.storage.exists(file_path):
-                raise FileNotFoundError(f"文件不存在: {file_path}")
-
             # 获取文件名
             if not filename:
                 filename = os.path.basename(file_path)
 
             # 获取内容类型
             if not content_type:
-                content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                content_type = _ctype(FileHandler._get_file_extension(filename)) or "application/octet-stream"
 
-            # 定义文件迭代器
-            def file_iterator(file_obj, chunk_size):
-                while True:
-                    chunk = file_obj.read(chunk_size)
-                    if not chunk:
-                        break
-                    yield chunk
+            # 打开文件，不存在时抛出 FileNotFoundError
+            file = _open_file(self.storage, file_path)
 
-            # 打开文件
-            file = self.storage.open(file_path)
-
-            # 创建响应
-            response = StreamingHttpResponse(
-                file_iterator(file, chunk_size),
-                content_type=content_type,
-            )
+            # 创建响应，服务器提供 wsgi.file_wrapper 时可直接 sendfile
+            response = FileResponse(file, content_type=content_type)
+            response.block_size = chunk_size
 
             # 设置文件大小
             if hasattr(file, "size"):
@@ -305,43 +406,64 @@ class FileCompressor:
         :return: 压缩文件路径
         """
         try:
-            # 创建临时目录
-            temp_dir = os.path.join(settings.MEDIA_ROOT, "temp", datetime.now().strftime("%Y%m%d"))
-            os.makedirs(temp_dir, exist_ok=True)
-
-            # 创建临时文件
-            temp_file = os.path.join(temp_dir, f"{uuid.uuid4().hex}.zip")
-
-            # 创建压缩文件
-            with zipfile.ZipFile(temp_file, "w", compression=compression) as zf:
-                for file in files:
-                    if isinstance(file, tuple):
-                        file_path, arc_name = file
-                    else:
-                        file_path = file
-                        arc_name = os.path.basename(file)
-
-                    # 检查文件是否存在
-                    if not self.storage.exists(file_path):
-                        raise FileNotFoundError(f"文件不存在: {file_path}")
-
-                    # 添加文件到压缩包
-                    with self.storage.open(file_path) as f:
-                        zf.writestr(arc_name, f.read())
-
-            # 保存压缩文件
-            with open(temp_file, "rb") as f:
-                save_path = self.storage.save(output_path, File(f))
-
-            # 删除临时文件
-            os.remove(temp_file)
-
-            return save_path
+            # 写入压缩包前先确认所有文件存在，避免留下不完整的压缩包
+            self._check_files_exist([file[0] if isinstance(file, tuple) else file for file in files])
+
+            date_time = datetime.now().timetuple()[:6]
+
+            # 先写入临时文件，完成后再通过 storage.save() 保存：由存储选取可用文件名并以独占方式创建，
+            # 并发调用不会互相覆盖；读取源文件失败时也不会在目标路径留下不完整的压缩包
+            with tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_SIZE) as out:
+                with zipfile.ZipFile(out, "w", compression=compression) as zf:
+                    for file in files:
+                        if isinstance(file, tuple):
+                            file_path, arc_name = file
+                        else:
+                            file_path = file
+                            arc_name = os.path.basename(file)
+
+                        # 已压缩格式直接存储，省去 deflate 开销
+                        info = zipfile.ZipInfo(arc_name, date_time=date_time)
+                        info.external_attr = 0o600 << 16
+                        if os.path.splitext(file_path)[1].lower() in COMPRESSED_EXTENSIONS:
+                            info.compress_type = zipfile.ZIP_STORED
+                        else:
+                            info.compress_type = compression
+
+                        # 流式添加文件到压缩包
+                        with _open_file(self.storage, file_path) as f, zf.open(info, "w", force_zip64=True) as w:
+                            shutil.copyfileobj(f, w, COPY_BUFFER_SIZE)
+
+                return self.storage.save(output_path, File(out))
 
         except Exception as e:
             logger.error(f"压缩文件失败: {str(e)}")
             raise
 
+    def _check_files_exist(self, file_paths: List[str]) -> None:
+        """
+        批量检查文件是否存在，每个目录只列举一次，远程存储不必逐个发送 exists() 请求
+        :param file_paths: 文件路径列表
+        """
+        names_by_dir: Dict[str, List[str]] = {}
+        for file_path in file_paths:
+            directory, name = os.path.split(file_path)
+            names_by_dir.setdefault(directory, []).append(name)
+
+        missing = []
+        for directory, names in names_by_dir.items():
+            try:
+                existing = set(self.storage.listdir(directory)[1])
+            except NotImplementedError:
+                # 存储不支持列举时，由打开文件时再检查
+                return
+            except (FileNotFoundError, OSError):
+                existing = set()
+            missing.extend(os.path.join(directory, name) for name in names if name not in existing)
+
+        if missing:
+            raise FileNotFoundError(f"文件不存在: {', '.join(missing)}")
+
     def extract_files(
         self,
         zip_path: str,
@@ -355,48 +477,46 @@ class FileCompressor:
         :param members: 要解压的文件列表
         :return: 解压后的文件列表
         """
+        temp_file = None
         try:
-            # 检查文件是否存在
-            if not self.storage.exists(zip_path):
-                raise FileNotFoundError(f"文件不存在: {zip_path}")
-
-            # 创建临时目录
-            temp_dir = os.path.join(settings.MEDIA_ROOT, "temp", datetime.now().strftime("%Y%m%d"))
-            os.makedirs(temp_dir, exist_ok=True)
-
-            # 创建临时文件
-            temp_file = os.path.join(temp_dir, f"{uuid.uuid4().hex}.zip")
-
-            # 复制压缩文件到临时文件
-            with self.storage.open(zip_path) as src, open(temp_file, "wb") as dst:
-                shutil.copyfileobj(src, dst)
-
-            # 解压文件
-            extracted_files = []
-            with zipfile.ZipFile(temp_file) as zf:
-                # 获取要解压的文件列表
-                if members is None:
+            # 本地存储直接读取原文件，不再复制
+            try:
+                local_file = self.storage.path(zip_path)
+            except NotImplementedError:
+                local_file = None
+
+            if local_file:
+                if not os.path.isfile(local_file):
+                    raise FileNotFoundError(f"文件不存在: {zip_path}")
+            else:
+                # 创建临时目录
+                temp_dir = os.path.join(settings.MEDIA_ROOT, "temp", datetime.now().strftime("%Y%m%d"))
+                os.makedirs(temp_dir, exist_ok=True)
+
+                # 复制压缩文件到临时文件
+                temp_file = local_file = os.path.join(temp_dir, f"{uuid.uuid4().hex}.zip")
+                with _open_file(self.storage, zip_path) as src, open(temp_file, "wb") as dst:
+                    shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+            # 获取要解压的文件列表
+            if members is None:
+                with zipfile.ZipFile(local_file) as zf:
                     members = zf.namelist()
 
-                # 解���文件
-                for member in members:
-                    # 生成解压路径
-                    if extract_path:
-                        save_path = os.path.join(extract_path, member)
-                    else:
-                        save_path = os.path.join(self.storage.base_location, member)
-
-                    # 创建目录
-                    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-
-                    # 解压文件
-                    with zf.open(member) as src, open(save_path, "wb") as dst:
-                        shutil.copyfileobj(src, dst)
-
-                    extracted_files.append(save_path)
-
-            # 删除临时文件
-            os.remove(temp_file)
+            # 生成解压路径
+            base_path = extract_path or self.storage.base_location
+            extracted_files = [os.path.join(base_path, member) for member in members]
+
+            # 多线程解压，zlib 解压和文件写入时会释放 GIL
+            workers = max(1, min(EXTRACT_MAX_WORKERS, len(members)))
+            tasks = list(zip(members, extracted_files))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # 每个线程处理一组成员，并使用各自的 ZipFile 句柄
+                futures = [
+                    executor.submit(self._extract_members, local_file, tasks[i::workers]) for i in range(workers)
+                ]
+                for future in futures:
+                    future.result()
 
             return extracted_files
 
@@ -404,11 +524,32 @@ class FileCompressor:
             logger.error(f"解压文件失败: {str(e)}")
             raise
 
+        finally:
+            # 删除临时文件
+            if temp_file and os.path.exists(temp_file):
+                os.remove(temp_file)
+
+    @staticmethod
+    def _extract_members(zip_file: str, tasks: List[Tuple[str, str]]) -> None:
+        """
+        解压一组成员，ZipFile 不是线程安全的，每组单独打开
+        :param zip_file: 本地压缩文件路径
+        :param tasks: (压缩包内路径, 解压路径) 列表
+        """
+        with zipfile.ZipFile(zip_file) as zf:
+            for member, save_path in tasks:
+                # 创建目录
+                os.makedirs(os.path.dirname(save_path), exist_ok=True)
+
+                # 解压文件
+                with zf.open(member) as src, open(save_path, "wb") as dst:
+                    shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
 
 class FileHasher:
     """文件哈希计算器"""
 
-    def __init__(self, storage: Optional[Storage] = None, chunk_size: int = 8192):
+    def __init__(self, storage: Optional[Storage] = None, chunk_size: int = 1024 * 1024):
         self.storage = storage or default_storage
         self.chunk_size = chunk_size
 
@@ -420,15 +561,15 @@ class FileHasher:
         :return: 哈希值
         """
         try:
-            # 检查文件是否存在
-            if not self.storage.exists(file_path):
-                raise FileNotFoundError(f"文件不存在: {file_path}")
+            with _open_file(self.storage, file_path) as f:
+                # Python 3.11+ 由 C 循环读取并释放 GIL
+                if hasattr(hashlib, "file_digest") and hasattr(f, "readinto"):
+                    return hashlib.file_digest(f, algorithm).hexdigest()
 
-            # 创建哈希对象
-            hasher = hashlib.new(algorithm)
+                # 创建哈希对象
+                hasher = hashlib.new(algorithm)
 
-            # 读取文件内容并更新哈希值
-            with self.storage.open(file_path) as f:
+                # 读取文件内容并更新哈希值
                 for chunk in iter(lambda: f.read(self.chunk_size), b""):
                     hasher.update(chunk)
 
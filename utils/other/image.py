@@ -1,16 +1,161 @@
+import asyncio
 import io
+import math
+import mmap
 import os
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 from django.conf import settings
 from django.core.files import File
-from django.core.files.storage import Storage, default_storage
-from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont
+from django.core.files.storage import FileSystemStorage, Storage, default_storage
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont, features
 
 from utils.log.logger import logger
 
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+# PyPI 的 Pillow wheel 自带 libjpeg-turbo，源码编译时缺失会使 JPEG 编解码慢数倍
+if not features.check_feature("libjpeg_turbo"):
+    logger.warning("Pillow 未链接 libjpeg-turbo，JPEG 编解码性能会明显下降")
+
+# 滤镜类型到处理函数的映射，函数接收图片对象和滤镜参数
+_FILTERS: Dict[str, Callable[[Image.Image, Dict[str, Any]], Image.Image]] = {
+    "BLUR": lambda image, kwargs: image.filter(ImageFilter.BLUR),
+    "CONTOUR": lambda image, kwargs: image.filter(ImageFilter.CONTOUR),
+    "EDGE_ENHANCE": lambda image, kwargs: image.filter(ImageFilter.EDGE_ENHANCE),
+    "EMBOSS": lambda image, kwargs: image.filter(ImageFilter.EMBOSS),
+    "SHARPEN": lambda image, kwargs: image.filter(ImageFilter.SHARPEN),
+    "SMOOTH": lambda image, kwargs: image.filter(ImageFilter.SMOOTH),
+    "BRIGHTNESS": lambda image, kwargs: ImageEnhance.Brightness(image).enhance(kwargs.get("factor", 1.0)),
+    "COLOR": lambda image, kwargs: ImageEnhance.Color(image).enhance(kwargs.get("factor", 1.0)),
+    "CONTRAST": lambda image, kwargs: ImageEnhance.Contrast(image).enhance(kwargs.get("factor", 1.0)),
+    "SHARPNESS": lambda image, kwargs: ImageEnhance.Sharpness(image).enhance(kwargs.get("factor", 1.0)),
+}
+
+
+def _encode_jpeg(image: Image.Image, quality: int) -> io.BytesIO:
+    """
+    编码为 JPEG，安装了 simplejpeg 时直接调用 libjpeg-turbo，省去 Pillow 每次编码的初始化开销
+    :param image: 图片对象
+    :param quality: 图片质量
+    :return: 编码结果
+    """
+    buffer = io.BytesIO()
+    if simplejpeg is not None and image.mode == "RGB":
+        buffer.write(
+            simplejpeg.encode_jpeg(
+                np.asarray(image),
+                quality=quality,
+                colorspace="RGB",
+                colorsubsampling="420",
+                fastdct=True,
+            )
+        )
+    else:
+        image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    """
+    解码图片并转为 RGB，已是 RGB 时直接返回解码后的图片，不再通过 convert 复制整幅像素
+    :param image: 图片对象
+    :return: 已加载像素的 RGB 图片对象，可在关闭源文件后继续使用
+    """
+    image.load()
+    if image.mode == "RGB":
+        return image
+    return image.convert("RGB")
+
+
+def _encode_webp(image: Image.Image, quality: int) -> io.BytesIO:
+    """
+    编码为 WebP，同等画质下通常比 JPEG 小约三成
+    :param image: 图片对象
+    :param quality: 图片质量
+    :return: 编码结果
+    """
+    buffer = io.BytesIO()
+    image.save(buffer, format="WEBP", quality=quality)
+    return buffer
+
+
+# 支持按质量查找目标大小的格式及其编码函数
+_ENCODERS: Dict[str, Callable[[Image.Image, int], io.BytesIO]] = {
+    "JPEG": _encode_jpeg,
+    "WEBP": _encode_webp,
+}
+
+
+def _guess_quality(
+    fit: Optional[Tuple[int, int]],
+    over: Optional[Tuple[int, int]],
+    max_size: int,
+    min_quality: int,
+    max_quality: int,
+) -> int:
+    """
+    估算下一次尝试的 JPEG 质量，文件大小的对数与质量近似呈线性关系
+    :param fit: 满足大小要求的最高质量及其大小
+    :param over: 超出大小限制的最低质量及其大小
+    :param max_size: 最大文件大小（字节）
+    :param min_quality: 候选区间下限
+    :param max_quality: 候选区间上限
+    :return: 限制在候选区间内的质量值
+    """
+    if over is None:
+        quality = (min_quality + max_quality) // 2
+    elif fit is None:
+        # 只有超限的结果时按大小比例缩小质量
+        quality = int(over[0] * max_size / over[1])
+    else:
+        (fit_quality, fit_size), (over_quality, over_size) = fit, over
+        quality = int(
+            fit_quality
+            + (over_quality - fit_quality) * math.log(max_size / fit_size) / math.log(over_size / fit_size)
+        )
+    return min(max(quality, min_quality), max_quality)
+
+
+@lru_cache(maxsize=64)
+def _load_font(font_path: Optional[str], font_size: int) -> ImageFont.ImageFont:
+    """
+    加载字体，解析后的字体对象缓存复用，避免每次重新读取字体文件
+    :param font_path: 字体路径，为空时使用默认字体
+    :param font_size: 字体大小
+    :return: 字体对象
+    """
+    if font_path:
+        return ImageFont.truetype(font_path, font_size)
+    return ImageFont.load_default()
+
+
+def _alpha_composite(image: Image.Image, overlay: Image.Image, position: Tuple[int, int]) -> None:
+    """
+    将 RGBA 图层原地合成到图片上，不再创建整张图大小的中间图层
+    :param image: RGBA 图片对象
+    :param overlay: RGBA 图层
+    :param position: 图层位置，允许为负数
+    """
+    x, y = position
+    # 图层完全落在图片之外时不绘制，与 paste 的行为一致
+    if -x >= overlay.width or -y >= overlay.height or x >= image.width or y >= image.height:
+        return
+    # 裁掉图层超出图片的部分
+    left, top = max(-x, 0), max(-y, 0)
+    right, bottom = min(overlay.width, image.width - x), min(overlay.height, image.height - y)
+    if (left, top, right, bottom) != (0, 0, overlay.width, overlay.height):
+        overlay = overlay.crop((left, top, right, bottom))
+    image.alpha_composite(overlay, dest=(max(x, 0), max(y, 0)))
+
 
 class ImageProcessor:
     """图片处理器"""
@@ -46,9 +191,10 @@ class ImageProcessor:
         """
         try:
             # 打开图片
-            with self.storage.open(image_path) as f:
-                image = Image.open(f)
-                image = image.convert("RGB")
+            with self._open_image(image_path) as image:
+                # JPEG 在解码时按 1/2、1/4、1/8 缩小，保留目标尺寸的 2 倍供 LANCZOS 使用，与 thumbnail 的 reducing_gap 一致
+                image.draft("RGB", (size[0] * 2, size[1] * 2))
+                image = _to_rgb(image)
 
                 # 调整大小
                 if keep_ratio:
@@ -86,9 +232,8 @@ class ImageProcessor:
         """
         try:
             # 打开图片
-            with self.storage.open(image_path) as f:
-                image = Image.open(f)
-                image = image.convert("RGB")
+            with self._open_image(image_path) as image:
+                image = _to_rgb(image)
 
                 # 裁剪图片
                 image = image.crop(box)
@@ -126,29 +271,24 @@ class ImageProcessor:
         :return: 保存路径
         """
         try:
-            # 打开图片
-            with self.storage.open(image_path) as f:
-                image = Image.open(f)
-                image = image.convert("RGB")
+            # 打开图片，直接转为 RGBA 以便原地合成
+            with self._open_image(image_path) as image:
+                image = image.convert("RGBA")
 
             # 打开水印图片
             if isinstance(watermark, str):
-                with self.storage.open(watermark) as f:
-                    watermark = Image.open(f)
+                with self._open_image(watermark) as watermark:
                     watermark = watermark.convert("RGBA")
             else:
-                watermark = watermark.copy()
+                watermark = watermark.convert("RGBA")
 
-            # 调整水印透明度
+            # 调整水印透明度，按比例缩放原有的 alpha 通道，保留水印本身的透明区域
             if opacity < 1:
-                watermark.putalpha(int(opacity * 255))
-
-            # 创建新图层
-            layer = Image.new("RGBA", image.size, (0, 0, 0, 0))
-            layer.paste(watermark, position)
+                alpha = np.asarray(watermark.getchannel("A"), dtype=np.uint16)
+                watermark.putalpha(Image.fromarray((alpha * int(opacity * 255) // 255).astype(np.uint8)))
 
             # 合并图层
-            image = Image.alpha_composite(image.convert("RGBA"), layer)
+            _alpha_composite(image, watermark, position)
             image = image.convert("RGB")
 
             # 生成保存路径
@@ -190,31 +330,28 @@ class ImageProcessor:
         :return: 保存路径
         """
         try:
-            # 打开图片
-            with self.storage.open(image_path) as f:
-                image = Image.open(f)
-                image = image.convert("RGB")
+            # 打开图片，直接转为 RGBA 以便原地合成
+            with self._open_image(image_path) as image:
+                image = image.convert("RGBA")
 
             # 创建字体对象
-            if font_path:
-                font = ImageFont.truetype(font_path, font_size)
-            else:
-                font = ImageFont.load_default()
+            font = _load_font(font_path, font_size)
 
-            # 创建新图层
-            layer = Image.new("RGBA", image.size, (0, 0, 0, 0))
+            # 创建只覆盖文字区域的图层
+            left, top, right, bottom = ImageDraw.Draw(image).textbbox(position, text, font=font)
+            layer = Image.new("RGBA", (max(right - left, 0), max(bottom - top, 0)), (0, 0, 0, 0))
             draw = ImageDraw.Draw(layer)
 
             # 绘制文字
             draw.text(
-                position,
+                (position[0] - left, position[1] - top),
                 text,
                 font=font,
                 fill=(*font_color, int(opacity * 255)),
             )
 
             # 合并图层
-            image = Image.alpha_composite(image.convert("RGBA"), layer)
+            _alpha_composite(image, layer, (left, top))
             image = image.convert("RGB")
 
             # 生成保存路径
@@ -236,6 +373,7 @@ class ImageProcessor:
         save_path: Optional[str] = None,
         max_size: Optional[int] = None,
         quality: Optional[int] = None,
+        format: str = "JPEG",
     ) -> str:
         """
         压缩图片
@@ -243,45 +381,64 @@ class ImageProcessor:
         :param save_path: 保存路径
         :param max_size: 最大文件大小（字节）
         :param quality: 图片质量
+        :param format: 输出格式，支持 JPEG 和 WEBP
         :return: 保存路径
         """
         try:
+            # 检查格式是否支持
+            format = format.upper()
+            encode = _ENCODERS.get(format)
+            if encode is None:
+                raise ValueError(f"不支持的压缩格式: {format}")
+
             # 打开图片
-            with self.storage.open(image_path) as f:
-                image = Image.open(f)
-                image = image.convert("RGB")
+            with self._open_image(image_path) as image:
+                image = _to_rgb(image)
 
             # 生成保存路径
             if not save_path:
                 directory = os.path.dirname(image_path)
-                filename = f"{os.path.splitext(os.path.basename(image_path))[0]}_compressed.jpg"
+                ext = "jpg" if format == "JPEG" else format.lower()
+                filename = f"{os.path.splitext(os.path.basename(image_path))[0]}_compressed.{ext}"
                 save_path = os.path.join(directory, filename)
 
             # 压缩图片
             if max_size:
-                # 二分法查找合适的质量值
+                # 按已测得的大小插值查找合适的质量值，编码参数与 _save_image 一致
                 min_quality = 1
                 max_quality = quality or self.quality
                 target_quality = max_quality
+                best_buffer = None
+                fit = over = None
+                slow_steps = -1
                 while min_quality <= max_quality:
                     # 尝试当前质量值
-                    buffer = io.BytesIO()
-                    image.save(buffer, format="JPEG", quality=target_quality)
+                    buffer = encode(image, target_quality)
                     size = buffer.tell()
+                    width = max_quality - min_quality
 
-                    # 判断是否满足大小要求
+                    # 判断是否满足大小要求，记录满足要求的最高质量结果
                     if size <= max_size:
-                        if min_quality == max_quality:
-                            break
+                        best_buffer = buffer
+                        fit = (target_quality, size)
                         min_quality = target_quality + 1
                     else:
+                        over = (target_quality, size)
                         max_quality = target_quality - 1
-                    target_quality = (min_quality + max_quality) // 2
 
-                quality = target_quality
+                    # 插值连续两次没能让区间减半时改用二分，保证最坏情况下的编码次数
+                    slow_steps = slow_steps + 1 if max_quality - min_quality > width // 2 else 0
+                    if slow_steps >= 2:
+                        target_quality = (min_quality + max_quality) // 2
+                        slow_steps = 0
+                    else:
+                        target_quality = _guess_quality(fit, over, max_size, min_quality, max_quality)
+
+                # 直接保存已编码的结果，都不满足时使用最低质量的结果
+                return self._store(best_buffer or buffer, save_path)
 
             # 保存图片
-            return self._save_image(image, save_path, quality=quality)
+            return self._save_image(image, save_path, format=format, quality=quality)
 
         except Exception as e:
             logger.error(f"压缩图片失败: {str(e)}")
@@ -309,9 +466,8 @@ class ImageProcessor:
                 raise ValueError(f"不支持的图片格式: {format}")
 
             # 打开图片
-            with self.storage.open(image_path) as f:
-                image = Image.open(f)
-                image = image.convert("RGB")
+            with self._open_image(image_path) as image:
+                image = _to_rgb(image)
 
             # 生��保存路径
             if not save_path:
@@ -344,38 +500,17 @@ class ImageProcessor:
         :return: 保存路径
         """
         try:
+            # 先校验滤镜类型，不支持时无需解码图片
+            apply = _FILTERS.get(filter_type)
+            if apply is None:
+                raise ValueError(f"不支持的滤镜类型: {filter_type}")
+
             # 打开图片
-            with self.storage.open(image_path) as f:
-                image = Image.open(f)
-                image = image.convert("RGB")
+            with self._open_image(image_path) as image:
+                image = _to_rgb(image)
 
             # 应用滤镜
-            if filter_type == "BLUR":
-                image = image.filter(ImageFilter.BLUR)
-            elif filter_type == "CONTOUR":
-                image = image.filter(ImageFilter.CONTOUR)
-            elif filter_type == "EDGE_ENHANCE":
-                image = image.filter(ImageFilter.EDGE_ENHANCE)
-            elif filter_type == "EMBOSS":
-                image = image.filter(ImageFilter.EMBOSS)
-            elif filter_type == "SHARPEN":
-                image = image.filter(ImageFilter.SHARPEN)
-            elif filter_type == "SMOOTH":
-                image = image.filter(ImageFilter.SMOOTH)
-            elif filter_type == "BRIGHTNESS":
-                factor = kwargs.get("factor", 1.0)
-                image = ImageEnhance.Brightness(image).enhance(factor)
-            elif filter_type == "COLOR":
-                factor = kwargs.get("factor", 1.0)
-                image = ImageEnhance.Color(image).enhance(factor)
-            elif filter_type == "CONTRAST":
-                factor = kwargs.get("factor", 1.0)
-                image = ImageEnhance.Contrast(image).enhance(factor)
-            elif filter_type == "SHARPNESS":
-                factor = kwargs.get("factor", 1.0)
-                image = ImageEnhance.Sharpness(image).enhance(factor)
-            else:
-                raise ValueError(f"不支持的滤镜类型: {filter_type}")
+            image = apply(image, kwargs)
 
             # 生成保存路径
             if not save_path:
@@ -390,6 +525,74 @@ class ImageProcessor:
             logger.error(f"应用滤镜失败: {str(e)}")
             raise
 
+    # 异步接口：在线程池中执行对应的同步方法，Pillow 编解码期间会释放 GIL，事件循环可以继续处理其他请求
+
+    async def resize_image_async(self, *args: Any, **kwargs: Any) -> str:
+        """
+        异步调整图片大小，参数与 resize_image 相同
+        :return: 保存路径
+        """
+        return await asyncio.to_thread(self.resize_image, *args, **kwargs)
+
+    async def crop_image_async(self, *args: Any, **kwargs: Any) -> str:
+        """
+        异步裁剪图片，参数与 crop_image 相同
+        :return: 保存路径
+        """
+        return await asyncio.to_thread(self.crop_image, *args, **kwargs)
+
+    async def add_watermark_async(self, *args: Any, **kwargs: Any) -> str:
+        """
+        异步添加水印，参数与 add_watermark 相同
+        :return: 保存路径
+        """
+        return await asyncio.to_thread(self.add_watermark, *args, **kwargs)
+
+    async def add_text_watermark_async(self, *args: Any, **kwargs: Any) -> str:
+        """
+        异步添加文字水印，参数与 add_text_watermark 相同
+        :return: 保存路径
+        """
+        return await asyncio.to_thread(self.add_text_watermark, *args, **kwargs)
+
+    async def compress_image_async(self, *args: Any, **kwargs: Any) -> str:
+        """
+        异步压缩图片，参数与 compress_image 相同
+        :return: 保存路径
+        """
+        return await asyncio.to_thread(self.compress_image, *args, **kwargs)
+
+    async def convert_format_async(self, *args: Any, **kwargs: Any) -> str:
+        """
+        异步转换格式，参数与 convert_format 相同
+        :return: 保存路径
+        """
+        return await asyncio.to_thread(self.convert_format, *args, **kwargs)
+
+    async def apply_filter_async(self, *args: Any, **kwargs: Any) -> str:
+        """
+        异步应用滤镜，参数与 apply_filter 相同
+        :return: 保存路径
+        """
+        return await asyncio.to_thread(self.apply_filter, *args, **kwargs)
+
+    @contextmanager
+    def _open_image(self, image_path: str) -> Iterator[Image.Image]:
+        """
+        打开图片，本地存储的文件映射为只读 mmap，Pillow 直接从页缓存读取，不再经过 File 对象的缓冲
+        :param image_path: 图片路径
+        :return: 图片对象，只能在上下文内读取像素
+        """
+        if isinstance(self.storage, FileSystemStorage):
+            full_path = self.storage.path(image_path)
+            if os.path.getsize(full_path):
+                with open(full_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    yield Image.open(mm)
+                return
+
+        with self.storage.open(image_path) as f:
+            yield Image.open(f)
+
     def _save_image(
         self,
         image: Image.Image,
@@ -406,17 +609,35 @@ class ImageProcessor:
         :return: 保存路径
         """
         # 创建临时文件
-        buffer = io.BytesIO()
-        image.save(
-            buffer,
-            format=format or "JPEG",
-            quality=quality or self.quality,
-            optimize=True,
-        )
-        buffer.seek(0)
+        format = format or "JPEG"
+        encode = _ENCODERS.get(format)
+        if encode is not None:
+            buffer = encode(image, quality or self.quality)
+        else:
+            buffer = io.BytesIO()
+            image.save(
+                buffer,
+                format=format,
+                quality=quality or self.quality,
+                optimize=True,
+            )
 
         # 保存文件
-        return self.storage.save(save_path, File(buffer))
+        return self._store(buffer, save_path)
+
+    def _store(self, buffer: io.BytesIO, save_path: str) -> str:
+        """
+        保存已编码的图片
+        整个缓冲区作为一个分块交给存储，本地存储一次写入，不再按 64KB 切片逐块写入
+        :param buffer: 已编码的图片数据
+        :param save_path: 保存路径
+        :return: 保存路径
+        """
+        size = buffer.seek(0, io.SEEK_END)
+        buffer.seek(0)
+        file = File(buffer)
+        file.DEFAULT_CHUNK_SIZE = max(size, 1)
+        return self.storage.save(save_path, file)
 
 
 # 创建默认图片处理器实例
@@ -482,6 +703,12 @@ brightened_path = processor.apply_filter(
     factor=1.5
 )
 
+# 在异步视图中使用
+resized_path = await processor.resize_image_async(
+    "uploads/image.jpg",
+    size=(800, 600)
+)
+
 # 配置示例
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 MEDIA_URL = "/media/"
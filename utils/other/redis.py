@@ -1,12 +1,36 @@
 import hashlib
 import json
 import logging
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 from django.core.cache import caches
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from xxhash import xxh3_128_hexdigest
+except ImportError:
+    xxh3_128_hexdigest = None
+
 logger = logging.getLogger(__name__)
 
+# orjson 默认不接受非字符串的字典键，与 json.dumps 保持一致
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def _dumps(obj: Any) -> bytes:
+    """
+    将对象序列化为 UTF-8 编码的 JSON 字节串，优先使用 orjson
+    :param obj: 要序列化的对象
+    :return: 序列化后的字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=ORJSON_OPTIONS)
+    return json.dumps(obj, default=str).encode("utf-8")
+
 
 class FastJsonRedisSerializer:
     """自定义 Redis 序列化器，使用 JSON 序列化和反序列化对象"""
@@ -19,7 +43,7 @@ class FastJsonRedisSerializer:
         """
         if obj is None:
             return None
-        return json.dumps(obj, default=str).encode("utf-8")
+        return _dumps(obj)
 
     def deserialize(self, data: Optional[bytes]) -> Any:
         """
@@ -29,15 +53,17 @@ class FastJsonRedisSerializer:
         """
         if not data:
             return None
-        return json.loads(data.decode("utf-8"))
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
 
 
 class StringRedisSerializer:
     """字符串类型 Redis 键的序列化器"""
 
     def serialize(self, obj: str) -> bytes:
-        """序列化字符串为字节数组"""
-        return json.dumps(obj).encode("utf-8")
+        """序列化字符串为字节数组，直接按 UTF-8 编码，与反序列化对称"""
+        return obj.encode("utf-8")
 
     def deserialize(self, data: Optional[bytes]) -> Optional[str]:
         """反序列化字节数组为字符串"""
@@ -46,7 +72,8 @@ class StringRedisSerializer:
 
 def generate_cache_key(target: Any, method: Any, *params: Any) -> str:
     """
-    生成缓存键，使用 SHA-256 哈希
+    生成缓存键，优先使用 xxh3_128 哈希，未安装 xxhash 时退回 BLAKE2b
+    缓存键只要求唯一，不需要抗碰撞，两种哈希都输出 32 位十六进制字符串
     :param target: 目标对象
     :param method: 方法对象
     :param params: 参数列表
@@ -58,8 +85,10 @@ def generate_cache_key(target: Any, method: Any, *params: Any) -> str:
         "package": target.__module__,
         "params": params,
     }
-    json_string = json.dumps(container, default=str)
-    return hashlib.sha256(json_string.encode("utf-8")).hexdigest()
+    data = _dumps(container)
+    if xxh3_128_hexdigest is not None:
+        return xxh3_128_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
 
 class CustomCache:
@@ -84,6 +113,18 @@ class CustomCache:
             logger.error(f"缓存获取错误，键[{key}]: {e}")
             return None
 
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        批量获取缓存值，一次请求取回所有键
+        :param keys: 缓存键列表
+        :return: 命中的键值字典，未命中的键不包含在内
+        """
+        try:
+            return self.cache.get_many(keys)
+        except Exception as e:
+            logger.error(f"缓存批量获取错误，键{keys}: {e}")
+            return {}
+
     def set(self, key: str, value: Any, timeout: int = 7200) -> bool:
         """
         设置缓存值
@@ -118,7 +159,7 @@ class CustomCache:
         :param key: 缓存键
         :return: 是否存在
         """
-        return self.cache.get(key) is not None
+        return self.cache.has_key(key)
 
     def incr(self, key: str, delta: int = 1) -> Optional[int]:
         """
@@ -1,31 +1,64 @@
 import random
+from functools import lru_cache
 
 import inflection
 
 
+@lru_cache(maxsize=4096)
+def _camel(key: str) -> str:
+    """
+    将单个键转换为驼峰命名法，接口返回中同样的键会反复出现，结果缓存复用
+    :param key: 键
+    :return: 驼峰命名的键
+    """
+    # 仅在需要时转换键
+    return inflection.camelize(key, uppercase_first_letter=False) if "_" in key else key
+
+
+def _camel_node(value):
+    """
+    为字典或列表创建空容器，其它值原样返回
+    :param value: 原始值
+    :return: (新值, 是否需要继续转换)
+    """
+    if isinstance(value, dict):
+        return {}, True
+    if isinstance(value, list):
+        return [], True
+    return value, False
+
+
 def convert_dict_keys_to_camel_case(data):
     """
     将字典中的键转换为驼峰命名法
+    使用显式栈代替递归，深层嵌套的数据不会触及递归深度限制
     :param data: 字典数据
     :return: 转换后的字典数据
     """
-    # 判断数据类型是否为字典
-    if isinstance(data, dict):
-        new_data = {}
-        for k, v in data.items():
-            # 仅在需要时转换键
-            new_key = inflection.camelize(k, uppercase_first_letter=False) if "_" in k else k
-            # 递归转换字典中的值
-            new_data[new_key] = convert_dict_keys_to_camel_case(v)
-        return new_data
-    # 判断数据类型是否为列表
-    elif isinstance(data, list):
-        # 递归转换列表中的每一项
-        return [convert_dict_keys_to_camel_case(item) for item in data]
-    else:
+    result, nested = _camel_node(data)
+    if not nested:
         # 返回原始数据
         return data
 
+    stack = [(data, result)]
+    while stack:
+        src, dst = stack.pop()
+        # 判断数据类型是否为字典
+        if isinstance(src, dict):
+            for k, v in src.items():
+                new_value, nested = _camel_node(v)
+                if nested:
+                    stack.append((v, new_value))
+                dst[_camel(k) if isinstance(k, str) else k] = new_value
+        # 列表中的每一项
+        else:
+            for item in src:
+                new_value, nested = _camel_node(item)
+                if nested:
+                    stack.append((item, new_value))
+                dst.append(new_value)
+    return result
+
 
 def code_number(ln: int):
     """
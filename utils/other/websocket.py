@@ -1,5 +1,49 @@
 import json
+import time
 from datetime import datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 按秒缓存的时间戳：[生成时的秒数, ISO 格式字符串]
+_TS_CACHE = [0, ""]
+
+
+def _timestamp() -> str:
+    """
+    获取当前时间的 ISO 格式字符串，同一秒内复用已生成的结果
+    :return: 精确到秒的 ISO 格式时间
+    """
+    now = int(time.time())
+    if now != _TS_CACHE[0]:
+        _TS_CACHE[:] = [now, datetime.fromtimestamp(now).isoformat()]
+    return _TS_CACHE[1]
+
+
+def _dumps(obj: Any) -> str:
+    """
+    将消息序列化为 JSON 文本，优先使用 orjson
+    :param obj: 要序列化的对象
+    :return: JSON 字符串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def _loads(text: str) -> Any:
+    """
+    解析 JSON 文本，优先使用 orjson
+    orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，调用方统一捕获后者即可
+    :param text: JSON 字符串
+    :return: 解析后的对象
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
 
 
 async def websocket_application(scope: dict, receive: callable, send: callable) -> None:
@@ -11,66 +55,74 @@ async def websocket_application(scope: dict, receive: callable, send: callable)
     :param send: 用于发送事件的异步函数。
     """
     # 初始化连接状态
-    connection_id = scope.get("client", [""])[0]
-    is_connected = False
+    state = {"connection_id": scope.get("client", [""])[0], "is_connected": False, "closed": False}
 
     try:
-        while True:
-            # 等待接收客户端事件
+        while not state["closed"]:
+            # 等待接收客户端事件，按事件类型查表分发
             event = await receive()
-            event_type = event["type"]
-
-            # 处理 WebSocket 连接事件
-            if event_type == "websocket.connect":
-                # 建立连接并保存连接状态
-                is_connected = True
-                await send({"type": "websocket.accept"})
-                # 发送欢迎消息
-                await send({"type": "websocket.send", "text": f"欢迎连接! 您的连接ID是: {connection_id}"})
-
-            # 处理 WebSocket 断开事件
-            elif event_type == "websocket.disconnect":
-                # 清理连接状态
-                is_connected = False
-                # 记录连接断开
-                print(f"客户端 {connection_id} 已断开连接")
-                break
-
-            # 处理 WebSocket 消息接收事件
-            elif event_type == "websocket.receive":
-                message = event.get("text", "")
-
-                # 心跳检测
-                if message == "ping":
-                    await send({"type": "websocket.send", "text": "pong!"})
-
-                # 处理JSON消息
-                elif message.startswith("{"):
-                    try:
-                        data = json.loads(message)
-                        # 根据消息类型处理不同业务逻辑
-                        msg_type = data.get("type")
-                        if msg_type == "chat":
-                            # 处理聊天消息
-                            await handle_chat_message(data, send)
-                        elif msg_type == "notification":
-                            # 处理通知消息
-                            await handle_notification(data, send)
-                    except json.JSONDecodeError:
-                        await send({"type": "websocket.send", "text": "消息格式错误，请发送正确的JSON格式"})
-
-                # 处理其他文本消息
-                else:
-                    await send({"type": "websocket.send", "text": f"收到消息: {message}"})
+            handler = _EVENT_HANDLERS.get(event["type"])
+            if handler is not None:
+                await handler(event, send, state)
 
     except Exception as e:
         # 异常处理和日志记录
-        error_msg = f"WebSocket错误 [客户端 {connection_id}]: {str(e)}"
+        error_msg = f"WebSocket错误 [客户端 {state['connection_id']}]: {str(e)}"
         print(error_msg)
-        if is_connected:
+        if state["is_connected"]:
             await send({"type": "websocket.send", "text": "服务器发生错误，请稍后重试"})
 
 
+async def _on_connect(event: dict, send: callable, state: dict) -> None:
+    """处理 WebSocket 连接事件"""
+    # 建立连接并保存连接状态
+    state["is_connected"] = True
+    await send({"type": "websocket.accept"})
+    # 发送欢迎消息
+    await send({"type": "websocket.send", "text": f"欢迎连接! 您的连接ID是: {state['connection_id']}"})
+
+
+async def _on_disconnect(event: dict, send: callable, state: dict) -> None:
+    """处理 WebSocket 断开事件"""
+    # 清理连接状态
+    state["is_connected"] = False
+    state["closed"] = True
+    # 记录连接断开
+    print(f"客户端 {state['connection_id']} 已断开连接")
+
+
+async def _on_receive(event: dict, send: callable, state: dict) -> None:
+    """处理 WebSocket 消息接收事件"""
+    message = event.get("text", "")
+
+    # 心跳检测
+    if message == "ping":
+        await send({"type": "websocket.send", "text": "pong!"})
+        return
+
+    # 直接尝试解析，不再预先扫描消息前缀
+    try:
+        data = _loads(message)
+    except json.JSONDecodeError:
+        data = None
+        # 只有看起来像 JSON 对象的消息才提示格式错误
+        if message.startswith("{"):
+            await send({"type": "websocket.send", "text": "消息格式错误，请发送正确的JSON格式"})
+            return
+
+    # 处理JSON消息，根据消息类型查表处理不同业务逻辑
+    if isinstance(data, dict):
+        msg_type = data.get("type")
+        # 类型字段可能是列表等不可哈希的值，查表前先确认是字符串
+        handler = _MESSAGE_HANDLERS.get(msg_type) if isinstance(msg_type, str) else None
+        if handler is not None:
+            await handler(data, send)
+
+    # 处理其他文本消息
+    else:
+        await send({"type": "websocket.send", "text": f"收到消息: {message}"})
+
+
 async def handle_chat_message(data: dict, send: callable) -> None:
     """处理聊天消息"""
     content = data.get("content", "")
@@ -78,9 +130,7 @@ async def handle_chat_message(data: dict, send: callable) -> None:
     await send(
         {
             "type": "websocket.send",
-            "text": json.dumps(
-                {"type": "chat", "sender": sender, "content": content, "timestamp": datetime.now().isoformat()}
-            ),
+            "text": _dumps({"type": "chat", "sender": sender, "content": content, "timestamp": _timestamp()}),
         }
     )
 
@@ -92,13 +142,27 @@ async def handle_notification(data: dict, send: callable) -> None:
     await send(
         {
             "type": "websocket.send",
-            "text": json.dumps(
+            "text": _dumps(
                 {
                     "type": "notification",
                     "notification_type": notification_type,
                     "message": message,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": _timestamp(),
                 }
             ),
         }
     )
+
+
+# 事件类型到处理函数的映射
+_EVENT_HANDLERS = {
+    "websocket.connect": _on_connect,
+    "websocket.disconnect": _on_disconnect,
+    "websocket.receive": _on_receive,
+}
+
+# 业务消息类型到处理函数的映射
+_MESSAGE_HANDLERS = {
+    "chat": handle_chat_message,
+    "notification": handle_notification,
+}
@@ -1,10 +1,43 @@
 from collections import OrderedDict
 from typing import Any, Dict, Optional
 
-from django.core.paginator import InvalidPage
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import InvalidPage, Paginator
+from django.utils.functional import cached_property
 from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from utils.other.redis import generate_cache_key
+
+
+class CachedCountPaginator(Paginator):
+    """
+    缓存总数的分页器
+    同一条查询语句的 COUNT(*) 结果在缓存中保留一小段时间，翻页时不再重复统计
+    """
+
+    CACHE_TIMEOUT = 60  # 1分钟
+
+    @cached_property
+    def count(self) -> int:
+        query = getattr(self.object_list, "query", None)
+        if query is None:
+            return super().count
+
+        try:
+            sql, params = query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+
+        key = "pagination_count:" + generate_cache_key(self, type(self).count.func, sql, params)
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, self.CACHE_TIMEOUT)
+        return count
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -18,6 +51,7 @@ class StandardResultsSetPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 1000
     page_query_param = 'page'
+    django_paginator_class = CachedCountPaginator
 
     def get_paginated_response(self, data: Any) -> Response:
         return Response(OrderedDict([
@@ -81,4 +115,64 @@ class StandardResultsSetPagination(PageNumberPagination):
             self.display_page_controls = True
 
         self.request = request
-        return list(self.page) 
\ No newline at end of file
+        # 直接返回当前页的查询集切片，由序列化器迭代一次完成查询，不再额外复制成列表
+        return self.page.object_list
+
+
+class FastKeysetPagination(StandardResultsSetPagination):
+    """
+    键集分页器
+    按主键升序分页，通过 cursor 参数传入上一页最后一条记录的主键
+    多取一条记录判断是否还有下一页，不执行 COUNT(*)，适合大表的列表接口
+    注意：会覆盖查询集原有的排序，只支持向后翻页
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = '无效的游标'
+    template = None
+
+    def paginate_queryset(self, queryset: Any, request: Any, view: Optional[Any] = None) -> Any:
+        """
+        按主键取出当前页数据
+        """
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            try:
+                queryset = queryset.filter(pk__gt=cursor)
+            except (ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset.order_by('pk')[:page_size + 1])
+        self.has_next = len(results) > page_size
+        del results[page_size:]
+        self.next_cursor = results[-1].pk if self.has_next else None
+        return results
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_previous_link(self) -> Optional[str]:
+        return None
+
+    def get_paginated_response(self, data: Any) -> Response:
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', None),
+            ('page_size', self.get_page_size(self.request)),
+            ('results', data)
+        ]))
+
+    def get_paginated_response_schema(self, schema: Dict) -> Dict:
+        response_schema = super().get_paginated_response_schema(schema)
+        properties = response_schema['properties']
+        del properties['count']
+        properties['next']['example'] = 'http://api.example.org/accounts/?cursor=100'
+        properties['previous']['example'] = None
+        return response_schema
@@ -1,11 +1,14 @@
 import functools
 import logging
-from typing import Any, Callable, Dict, List, Optional, Set, Type, TypeVar, Union, cast
+import operator
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Type, TypeVar, Union, cast
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, Permission
 from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Model, Q, QuerySet
 from django.http import HttpRequest
 from rest_framework import permissions
@@ -21,6 +24,57 @@ logger = logging.getLogger(__name__)
 User = get_user_model()
 T = TypeVar("T", bound=Callable[..., Any])
 
+@functools.lru_cache(maxsize=1024)
+def _resolve_perm(app_label: str, codename: str) -> int:
+    """解析权限主键，结果常驻进程内存，权限被删除或重建后需调用 _resolve_perm.cache_clear()"""
+    return Permission.objects.values_list("pk", flat=True).get(
+        content_type__app_label=app_label,
+        codename=codename
+    )
+
+@functools.lru_cache(maxsize=1)
+def _guardian() -> Any:
+    """
+    获取 django-guardian 的 shortcuts 模块，首次调用时导入
+    guardian 为可选依赖，且导入时会加载其模型，不能放在模块顶层
+    """
+    from guardian import shortcuts
+    return shortcuts
+
+@functools.lru_cache(maxsize=1)
+def _guardian_checker() -> Any:
+    """获取 django-guardian 的 ObjectPermissionChecker 类，首次调用时导入"""
+    from guardian.core import ObjectPermissionChecker
+    return ObjectPermissionChecker
+
+def _cached_user_roles(request: Union[Request, HttpRequest]) -> Set[str]:
+    """获取当前请求用户的角色，结果保存在请求对象上，同一请求内的多次权限检查不再重复获取"""
+    roles = getattr(request, "_cached_roles", None)
+    if roles is None:
+        user = request.user
+        if user and user.is_authenticated:
+            roles = PermissionManager().get_user_roles(user)
+        else:
+            roles = set()
+        request._cached_roles = roles
+    return roles
+
+def _has_perms(request: Union[Request, HttpRequest], perms: Iterable[str]) -> bool:
+    """
+    检查当前请求用户是否拥有全部权限，权限集合保存在请求对象上
+    与 user.has_perms 一致：未激活用户没有任何权限，激活的超级管理员拥有全部权限
+    """
+    user = request.user
+    if not user or not user.is_active:
+        return False
+    if user.is_superuser:
+        return True
+    user_perms = getattr(request, "_cached_perms", None)
+    if user_perms is None:
+        user_perms = PermissionManager().get_user_permissions(user)
+        request._cached_perms = user_perms
+    return user_perms.issuperset(perms)
+
 class BaseObjectPermission(BasePermission):
     """基础对象权限类"""
     
@@ -37,6 +91,10 @@ class IsOwner(BaseObjectPermission):
     
     def has_object_permission(self, request: Request, view: Any, obj: Any) -> bool:
         """检查是否是对象所有者"""
+        # 超级管理员直接放行，不再读取对象的所有者字段
+        if getattr(request.user, "is_superuser", False):
+            return True
+            
         # 获取对象的所有者字段
         owner_field = getattr(view, "owner_field", "user")
         
@@ -45,6 +103,20 @@ class IsOwner(BaseObjectPermission):
         
         return bool(owner == request.user)
 
+class SuperuserFastPath(BasePermission):
+    """
+    超级管理员快速通过
+    放在组合权限的最左侧，超级管理员只需一次布尔判断即可短路后续的查询类检查
+    """
+    
+    def has_permission(self, request: Request, view: Any) -> bool:
+        """检查是否是超级管理员"""
+        return bool(getattr(request.user, "is_superuser", False))
+        
+    def has_object_permission(self, request: Request, view: Any, obj: Any) -> bool:
+        """检查是否是超级管理员"""
+        return bool(getattr(request.user, "is_superuser", False))
+
 class IsAdmin(BasePermission):
     """管理员权限"""
     
@@ -63,28 +135,24 @@ class HasRole(BasePermission):
     """角色权限"""
     
     def __init__(self, role: Union[str, List[str]]):
-        self.roles = [role] if isinstance(role, str) else role
+        self.roles = {role} if isinstance(role, str) else set(role)
         
     def has_permission(self, request: Request, view: Any) -> bool:
         """检查是否有指定角色"""
         if not request.user or not request.user.is_authenticated:
             return False
             
-        return bool(
-            request.user.groups.filter(name__in=self.roles).exists()
-        )
+        return bool(self.roles & _cached_user_roles(request))
 
 class HasPermission(BasePermission):
     """权限检查"""
     
     def __init__(self, perm: Union[str, List[str]]):
-        self.perms = [perm] if isinstance(perm, str) else perm
+        self.perms = frozenset([perm] if isinstance(perm, str) else perm)
         
     def has_permission(self, request: Request, view: Any) -> bool:
         """检查是否有指定权限"""
-        return bool(
-            request.user and request.user.has_perms(self.perms)
-        )
+        return _has_perms(request, self.perms)
 
 class RoleBasedPermission(BasePermission):
     """基于角色的权限"""
@@ -103,11 +171,7 @@ class RoleBasedPermission(BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
             
-        user_roles = set(
-            request.user.groups.values_list("name", flat=True)
-        )
-        
-        return bool(required_roles & user_roles)
+        return bool(required_roles & _cached_user_roles(request))
 
 class PermissionManager:
     """权限管理器"""
@@ -115,26 +179,44 @@ class PermissionManager:
     def __init__(self):
         self.cache_manager = CacheManager(prefix="permissions")
         
+    def _version(self, user: User) -> int:
+        """
+        获取用户缓存版本号，用户的权限、角色等缓存键都带有版本号，递增版本号即可使其全部失效
+        版本号缺失时以当前纳秒时间初始化，不会与过期前使用过的版本号重复
+        """
+        return self.cache_manager.get_or_set(f"version:{user.pk}", time.time_ns)
+        
+    def _versions(self, user_ids: List[Any]) -> Dict[Any, int]:
+        """批量获取用户缓存版本号"""
+        keys = {f"version:{pk}": pk for pk in user_ids}
+        versions = self.cache_manager.get_many(list(keys))
+        missing = {key: time.time_ns() for key in keys if key not in versions}
+        if missing:
+            self.cache_manager.set_many(missing)
+            versions.update(missing)
+        return {keys[key]: version for key, version in versions.items()}
+        
     @log_timing()
     def get_user_permissions(self, user: User) -> Set[str]:
-        """获取用户权限"""
-        cache_key = f"user_permissions:{user.pk}"
+        """获取用户权限，格式与 user.has_perms 一致，为 app_label.codename"""
+        cache_key = f"user_perm_names:{user.pk}:v{self._version(user)}"
         
         # 尝试从缓存获取
         permissions = self.cache_manager.get(cache_key)
         
         if permissions is None:
-            # 获取用户所有权限
-            permissions = set(
-                user.user_permissions.values_list("codename", flat=True)
-            )
-            
-            # 获取用户组权限
+            # 用户权限和用户组权限通过 UNION 合并为一次查询，由数据库去重
+            # Permission 自带默认排序，UNION 的子查询中不允许 ORDER BY，需要清除
+            user_permissions = Permission.objects.filter(
+                user=user
+            ).order_by().values_list("content_type__app_label", "codename")
             group_permissions = Permission.objects.filter(
                 group__user=user
-            ).values_list("codename", flat=True)
-            
-            permissions.update(group_permissions)
+            ).order_by().values_list("content_type__app_label", "codename")
+            permissions = {
+                f"{app_label}.{codename}"
+                for app_label, codename in user_permissions.union(group_permissions)
+            }
             
             # 缓存权限
             self.cache_manager.set(cache_key, permissions)
@@ -144,7 +226,7 @@ class PermissionManager:
     @log_timing()
     def get_user_roles(self, user: User) -> Set[str]:
         """获取用户角色"""
-        cache_key = f"user_roles:{user.pk}"
+        cache_key = f"user_roles:{user.pk}:v{self._version(user)}"
         
         # 尝试从缓存获取
         roles = self.cache_manager.get(cache_key)
@@ -160,10 +242,74 @@ class PermissionManager:
             
         return roles
         
+    @log_timing()
+    def get_user_permissions_bulk(self, users: List[User]) -> Dict[Any, Set[str]]:
+        """批量获取用户权限，一次读取缓存，未命中的用户合并为一次查询"""
+        return self._get_bulk(users, "user_perm_names", self._load_user_permissions)
+        
+    @log_timing()
+    def get_user_roles_bulk(self, users: List[User]) -> Dict[Any, Set[str]]:
+        """批量获取用户角色，一次读取缓存，未命中的用户合并为一次查询"""
+        return self._get_bulk(users, "user_roles", self._load_user_roles)
+        
+    def _get_bulk(
+        self,
+        users: List[User],
+        prefix: str,
+        loader: Callable[[List[Any]], List[Any]]
+    ) -> Dict[Any, Set[str]]:
+        """按用户主键批量读取缓存，未命中的部分通过 loader 查询后写回缓存"""
+        versions = self._versions([user.pk for user in users])
+        keys = {f"{prefix}:{pk}:v{version}": pk for pk, version in versions.items()}
+        hits = self.cache_manager.get_many(list(keys))
+        result = {keys[key]: value for key, value in hits.items()}
+        
+        missing = [pk for key, pk in keys.items() if key not in hits]
+        if missing:
+            loaded = {pk: set() for pk in missing}
+            for user_id, name in loader(missing):
+                loaded[user_id].add(name)
+            self.cache_manager.set_many(
+                {f"{prefix}:{pk}:v{versions[pk]}": value for pk, value in loaded.items()}
+            )
+            result.update(loaded)
+            
+        return result
+        
+    @staticmethod
+    def _load_user_permissions(user_ids: List[Any]) -> List[Any]:
+        """查询多个用户的权限，用户权限和用户组权限通过 UNION 合并为一次查询"""
+        user_permissions = User.user_permissions.through.objects.filter(
+            user_id__in=user_ids
+        ).values_list("user_id", "permission__content_type__app_label", "permission__codename")
+        group_permissions = Permission.objects.filter(
+            group__user__in=user_ids
+        ).order_by().values_list("group__user", "content_type__app_label", "codename")
+        return [
+            (user_id, f"{app_label}.{codename}")
+            for user_id, app_label, codename in user_permissions.union(group_permissions)
+        ]
+        
+    @staticmethod
+    def _load_user_roles(user_ids: List[Any]) -> List[Any]:
+        """查询多个用户的角色"""
+        return list(
+            User.groups.through.objects.filter(
+                user_id__in=user_ids
+            ).values_list("user_id", "group__name")
+        )
+        
     def clear_user_cache(self, user: User) -> None:
-        """清除用户缓存"""
-        self.cache_manager.delete(f"user_permissions:{user.pk}")
-        self.cache_manager.delete(f"user_roles:{user.pk}")
+        """清除用户缓存，递增版本号使该用户的全部缓存键失效"""
+        try:
+            self.cache_manager.incr(f"version:{user.pk}")
+        except ValueError:
+            # 版本号不存在时下次读取会生成新的版本号，旧缓存同样不会再被读取
+            pass
+        
+    def clear_users_cache(self, users: List[User]) -> None:
+        """批量清除用户缓存，一次删除所有用户的版本号，下次读取时生成新的版本号"""
+        self.cache_manager.delete_many([f"version:{user.pk}" for user in users])
         
     def assign_role(self, user: User, role: str) -> None:
         """分配角色"""
@@ -183,41 +329,88 @@ class PermissionManager:
     def assign_permission(self, user: User, perm: str) -> None:
         """分配权限"""
         app_label, codename = perm.split(".")
-        permission = Permission.objects.get(
-            content_type__app_label=app_label,
-            codename=codename
-        )
-        user.user_permissions.add(permission)
+        user.user_permissions.add(_resolve_perm(app_label, codename))
         self.clear_user_cache(user)
         
     def remove_permission(self, user: User, perm: str) -> None:
         """移除权限"""
         try:
             app_label, codename = perm.split(".")
-            permission = Permission.objects.get(
-                content_type__app_label=app_label,
-                codename=codename
-            )
-            user.user_permissions.remove(permission)
+            user.user_permissions.remove(_resolve_perm(app_label, codename))
             self.clear_user_cache(user)
         except Permission.DoesNotExist:
             pass
 
+    def bulk_assign_roles(self, users: List[User], roles: List[str]) -> None:
+        """批量分配角色，在一个事务内批量写入关联表，不触发 m2m_changed 信号"""
+        through = User.groups.through
+        with transaction.atomic():
+            group_ids = dict(Group.objects.filter(name__in=roles).values_list("name", "pk"))
+            missing = set(roles) - group_ids.keys()
+            if missing:
+                Group.objects.bulk_create([Group(name=name) for name in missing], ignore_conflicts=True)
+                group_ids = dict(Group.objects.filter(name__in=roles).values_list("name", "pk"))
+            through.objects.bulk_create(
+                [through(user_id=user.pk, group_id=group_id) for user in users for group_id in group_ids.values()],
+                ignore_conflicts=True,
+                batch_size=10000
+            )
+        self.clear_users_cache(users)
+        
+    def bulk_remove_roles(self, users: List[User], roles: List[str]) -> None:
+        """批量移除角色，一条 DELETE 完成，不触发 m2m_changed 信号"""
+        User.groups.through.objects.filter(
+            user_id__in=[user.pk for user in users],
+            group__name__in=roles
+        ).delete()
+        self.clear_users_cache(users)
+        
+    def bulk_assign_permissions(self, users: List[User], perms: List[str]) -> None:
+        """批量分配权限，在一个事务内批量写入关联表，不触发 m2m_changed 信号"""
+        permission_ids = [_resolve_perm(*perm.split(".")) for perm in perms]
+        through = User.user_permissions.through
+        with transaction.atomic():
+            through.objects.bulk_create(
+                [
+                    through(user_id=user.pk, permission_id=permission_id)
+                    for user in users
+                    for permission_id in permission_ids
+                ],
+                ignore_conflicts=True,
+                batch_size=10000
+            )
+        self.clear_users_cache(users)
+        
+    def bulk_remove_permissions(self, users: List[User], perms: List[str]) -> None:
+        """批量移除权限，一条 DELETE 完成，不存在的权限会被忽略，不触发 m2m_changed 信号"""
+        permission_ids = []
+        for perm in perms:
+            try:
+                permission_ids.append(_resolve_perm(*perm.split(".")))
+            except Permission.DoesNotExist:
+                pass
+        User.user_permissions.through.objects.filter(
+            user_id__in=[user.pk for user in users],
+            permission_id__in=permission_ids
+        ).delete()
+        self.clear_users_cache(users)
+
 def permission_required(
     perm: Union[str, List[str]],
     raise_exception: bool = True
 ) -> Callable[[T], T]:
     """权限要求装饰器"""
+    # 权限集合和错误信息在装饰时生成一次，请求时不再重复构建
+    perm_list = [perm] if isinstance(perm, str) else list(perm)
+    perms = frozenset(perm_list)
+    detail = f"Missing required permissions: {', '.join(perm_list)}"
+    
     def decorator(func: T) -> T:
         @functools.wraps(func)
         def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
-            perms = [perm] if isinstance(perm, str) else perm
-            
-            if not request.user.has_perms(perms):
+            if not _has_perms(request, perms):
                 if raise_exception:
-                    raise PermissionError(
-                        detail=f"Missing required permissions: {', '.join(perms)}"
-                    )
+                    raise PermissionError(detail=detail)
                 return None
                 
             return func(request, *args, **kwargs)
@@ -229,16 +422,17 @@ def role_required(
     raise_exception: bool = True
 ) -> Callable[[T], T]:
     """角色要求装饰器"""
+    # 角色集合和错误信息在装饰时生成一次，请求时不再重复构建
+    role_list = [role] if isinstance(role, str) else list(role)
+    roles = frozenset(role_list)
+    detail = f"Missing required roles: {', '.join(role_list)}"
+    
     def decorator(func: T) -> T:
         @functools.wraps(func)
         def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
-            roles = [role] if isinstance(role, str) else role
-            
-            if not request.user.groups.filter(name__in=roles).exists():
+            if roles.isdisjoint(_cached_user_roles(request)):
                 if raise_exception:
-                    raise PermissionError(
-                        detail=f"Missing required roles: {', '.join(roles)}"
-                    )
+                    raise PermissionError(detail=detail)
                 return None
                 
             return func(request, *args, **kwargs)
@@ -256,24 +450,22 @@ class ObjectPermissionManager:
         self,
         user: User,
         perms: Union[str, List[str]],
-        any_perm: bool = False
+        any_perm: bool = False,
+        select_related: Optional[List[str]] = None
     ) -> QuerySet:
-        """获取用户有权限的对象"""
+        """获取用户有权限的对象，select_related 用于预加载调用方后续要访问的外键"""
         if isinstance(perms, str):
             perms = [perms]
             
-        # 构建权限过滤条件
-        filters = None
-        for perm in perms:
-            q = Q(**{f"{perm}__user": user})
-            if filters is None:
-                filters = q
-            elif any_perm:
-                filters |= q
-            else:
-                filters &= q
-                
-        return self.model.objects.filter(filters)
+        # 一次性构建权限过滤条件，多表关联会产生重复行，需要去重
+        combine = operator.or_ if any_perm else operator.and_
+        filters = functools.reduce(combine, (Q(**{f"{perm}__user": user}) for perm in perms))
+        queryset = self.model.objects.filter(filters).distinct()
+        
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+            
+        return queryset
         
     def assign_perm(
         self,
@@ -282,8 +474,7 @@ class ObjectPermissionManager:
         obj: Model
     ) -> None:
         """分配对象权限"""
-        from guardian.shortcuts import assign_perm
-        assign_perm(perm, user, obj)
+        _guardian().assign_perm(perm, user, obj)
         self.clear_cache(obj)
         
     def remove_perm(
@@ -293,8 +484,7 @@ class ObjectPermissionManager:
         obj: Model
     ) -> None:
         """移除对象权限"""
-        from guardian.shortcuts import remove_perm
-        remove_perm(perm, user, obj)
+        _guardian().remove_perm(perm, user, obj)
         self.clear_cache(obj)
         
     def clear_cache(self, obj: Model) -> None:
@@ -303,8 +493,13 @@ class ObjectPermissionManager:
         
     def get_perms(self, user: User, obj: Model) -> Set[str]:
         """获取用户对对象的权限"""
-        from guardian.shortcuts import get_perms
-        return set(get_perms(user, obj))
+        return set(_guardian().get_perms(user, obj))
+        
+    def get_perms_bulk(self, user: User, objs: List[Model]) -> Dict[Any, Set[str]]:
+        """批量获取用户对多个对象的权限，预先一次查出全部对象权限，避免逐个对象查询"""
+        checker = _guardian_checker()(user)
+        checker.prefetch_perms(objs)
+        return {obj.pk: set(checker.get_perms(obj)) for obj in objs}
 
 # 使用示例
 """
@@ -313,6 +508,10 @@ from rest_framework.views import APIView
 
 class ExampleView(APIView):
     permission_classes = [IsOwner | IsAdmin]
+
+# 组合权限按从左到右的顺序短路，开销最小的检查放在最前面
+class EditorView(APIView):
+    permission_classes = [SuperuserFastPath | IsOwner | HasRole("editor")]
     
     def get(self, request):
         return Response({"message": "Hello, World!"})
@@ -332,6 +531,9 @@ permission_manager = PermissionManager()
 user_permissions = permission_manager.get_user_permissions(user)
 user_roles = permission_manager.get_user_roles(user)
 
+# 批量获取多个用户的角色，返回 {用户主键: 角色集合}
+users_roles = permission_manager.get_user_roles_bulk(users)
+
 # 5. 使用对象权限管理器
 class Post(models.Model):
     title = models.CharField(max_length=100)
@@ -350,6 +552,14 @@ user_posts = post_permissions.get_objects_for_user(
     ["view_post", "edit_post"]
 )
 
+# 列表接口中批量获取对象权限，通过序列化器上下文传给每个对象使用
+class PostViewSet(viewsets.ModelViewSet):
+    def list(self, request):
+        page = self.paginate_queryset(self.get_queryset())
+        perms = post_permissions.get_perms_bulk(request.user, page)
+        serializer = self.get_serializer(page, many=True, context={"request": request, "perms": perms})
+        return self.get_paginated_response(serializer.data)
+
 # 6. 在settings.py中配置权限
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
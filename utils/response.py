@@ -1,15 +1,28 @@
+import json
+import operator
+import os
+from itertools import islice
 from datetime import date, datetime, time
 from decimal import Decimal
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
 from uuid import UUID
 
+from django.conf import settings
 from django.db.models import Model
-from django.http import FileResponse, StreamingHttpResponse
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.encoding import escape_uri_path
 from rest_framework import status
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class ResponseCode(Enum):
@@ -29,6 +42,83 @@ class ResponseCode(Enum):
     SERVICE_UNAVAILABLE = 503
 
 
+# 业务状态码对应的默认消息，导入时生成一次
+_DEFAULT_MESSAGES = {
+    code.value: message
+    for code, message in (
+        (ResponseCode.SUCCESS, "操作成功"),
+        (ResponseCode.CREATED, "创建成功"),
+        (ResponseCode.ACCEPTED, "请求已受理"),
+        (ResponseCode.NO_CONTENT, "无内容"),
+        (ResponseCode.BAD_REQUEST, "请求参数错误"),
+        (ResponseCode.UNAUTHORIZED, "未授权"),
+        (ResponseCode.FORBIDDEN, "禁止访问"),
+        (ResponseCode.NOT_FOUND, "资源不存在"),
+        (ResponseCode.METHOD_NOT_ALLOWED, "方法不允许"),
+        (ResponseCode.CONFLICT, "资源冲突"),
+        (ResponseCode.INTERNAL_ERROR, "服务器内部错误"),
+        (ResponseCode.SERVICE_UNAVAILABLE, "服务不可用"),
+    )
+}
+
+
+@lru_cache(maxsize=256)
+def _field_getter(model_cls: type) -> tuple:
+    """
+    获取模型的字段名和批量取值函数，按模型类缓存
+    :param model_cls: 模型类
+    :return: (字段名元组, 返回字段值元组的取值函数)
+    """
+    names = tuple(field.name for field in model_cls._meta.fields)
+    getter = operator.attrgetter(*names)
+    # 只有一个字段时 attrgetter 返回单个值，统一包装成元组
+    if len(names) == 1:
+        return names, lambda instance: (getter(instance),)
+    return names, getter
+
+
+def _keep(response: "ApiResponse", data: Any) -> Any:
+    """原样返回"""
+    return data
+
+
+def _to_str(response: "ApiResponse", data: Any) -> str:
+    """转换为字符串"""
+    return str(data)
+
+
+def _serialize_sequence(response: "ApiResponse", data: Any) -> list:
+    """逐项序列化列表、元组和集合"""
+    serialize = response._serialize_data
+    return [serialize(item) for item in data]
+
+
+def _serialize_dict(response: "ApiResponse", data: dict) -> dict:
+    """逐项序列化字典的值"""
+    serialize = response._serialize_data
+    return {key: serialize(value) for key, value in data.items()}
+
+
+# 按具体类型分发的序列化函数，一次字典查找代替逐个 isinstance 判断
+# 子类（如 OrderedDict、IntEnum）不在表中，仍走 _serialize_other 按原有顺序判断
+_SERIALIZERS = {
+    type(None): _keep,
+    str: _keep,
+    int: _keep,
+    float: _keep,
+    bool: _keep,
+    datetime: _to_str,
+    date: _to_str,
+    time: _to_str,
+    Decimal: _to_str,
+    UUID: _to_str,
+    list: _serialize_sequence,
+    tuple: _serialize_sequence,
+    set: _serialize_sequence,
+    dict: _serialize_dict,
+}
+
+
 class ApiResponse(Response):
     """
     统一API响应格式
@@ -95,9 +185,13 @@ class ApiResponse(Response):
 
     def _serialize_data(self, data: Any) -> Any:
         """序列化数据"""
-        if data is None:
-            return None
+        serialize = _SERIALIZERS.get(type(data))
+        if serialize is not None:
+            return serialize(self, data)
+        return self._serialize_other(data)
 
+    def _serialize_other(self, data: Any) -> Any:
+        """序列化分发表之外的类型"""
         if isinstance(data, (str, int, float, bool)):
             return data
 
@@ -126,33 +220,29 @@ class ApiResponse(Response):
         if hasattr(instance, "to_dict"):
             return instance.to_dict()
 
-        return {field.name: self._serialize_data(getattr(instance, field.name)) for field in instance._meta.fields}
+        names, getter = _field_getter(type(instance))
+        serialize = self._serialize_data
+        return {name: serialize(value) for name, value in zip(names, getter(instance))}
 
     def _get_default_message(self, code: int) -> str:
         """获取默认消息"""
-        messages = {
-            ResponseCode.SUCCESS.value: "操作成功",
-            ResponseCode.CREATED.value: "创建成功",
-            ResponseCode.ACCEPTED.value: "请求已受理",
-            ResponseCode.NO_CONTENT.value: "无内容",
-            ResponseCode.BAD_REQUEST.value: "请求参数错误",
-            ResponseCode.UNAUTHORIZED.value: "未授权",
-            ResponseCode.FORBIDDEN.value: "禁止访问",
-            ResponseCode.NOT_FOUND.value: "资源不存在",
-            ResponseCode.METHOD_NOT_ALLOWED.value: "方法不允许",
-            ResponseCode.CONFLICT.value: "资源冲突",
-            ResponseCode.INTERNAL_ERROR.value: "服务器内部错误",
-            ResponseCode.SERVICE_UNAVAILABLE.value: "服务不可用",
-        }
-        return messages.get(code, "未知状态")
+        return _DEFAULT_MESSAGES.get(code, "未知状态")
 
 
 class ApiJsonRenderer(JSONRenderer):
     """
     自定义JSON渲染器
     支持更多数据类型的序列化
+    开启 USE_ORJSON_RENDERER 时使用 orjson 编码，orjson 不支持的类型交给 DRF 的 JSONEncoder.default 转换
     """
 
+    # 为 None 时跟随 USE_ORJSON_RENDERER 配置，视图中可使用 OrjsonApiRenderer 单独开启
+    use_orjson: Optional[bool] = None
+    orjson_options = (
+        orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson is not None else 0
+    )
+    _encoder = JSONEncoder()
+
     def render(
         self,
         data: Any,
@@ -169,9 +259,37 @@ class ApiJsonRenderer(JSONRenderer):
         if renderer_context is None:
             renderer_context = {}
 
+        data = self._wrap(data, renderer_context)
+
+        # 需要缩进输出时（如可浏览 API）仍由 DRF 编码，orjson 只支持固定的两空格缩进
+        indent = self.get_indent(accepted_media_type or "", renderer_context)
+        if data is not None and indent is None and self._orjson_enabled():
+            return orjson.dumps(data, default=self._encoder.default, option=self.orjson_options)
+
+        return super().render(data, accepted_media_type, renderer_context)
+
+    def _orjson_enabled(self) -> bool:
+        """是否使用 orjson 编码"""
+        if orjson is None:
+            return False
+        if self.use_orjson is not None:
+            return self.use_orjson
+        return getattr(settings, "USE_ORJSON_RENDERER", False)
+
+    def _wrap(self, data: Any, renderer_context: dict) -> Any:
+        """
+        包装响应数据，错误响应转换为统一的错误格式
+        :param data: 响应数据
+        :param renderer_context: 渲染上下文
+        :return: 包装后的数据
+        """
         # 获取响应对象
         response = renderer_context.get("response")
 
+        # ApiResponse 构造时已生成统一格式，直接输出，不再重复包装
+        if isinstance(response, ApiResponse):
+            return data
+
         if response is not None:
             if not isinstance(data, dict):
                 data = {"data": data}
@@ -184,7 +302,16 @@ class ApiJsonRenderer(JSONRenderer):
                     "errors": data if "detail" not in data else None,
                 }
 
-        return super().render(data, accepted_media_type, renderer_context)
+        return data
+
+
+class OrjsonApiRenderer(ApiJsonRenderer):
+    """
+    始终使用 orjson 编码的渲染器
+    用于在 USE_ORJSON_RENDERER 关闭时按视图逐步启用
+    """
+
+    use_orjson = True
 
 
 def success_response(
@@ -221,21 +348,64 @@ def error_response(
     return ApiResponse(data=data, message=message, code=code, **kwargs)
 
 
+# 由 Django 发送文件时每次读取的块大小
+FILE_BLOCK_SIZE = 1024 * 1024
+
+
+def _sendfile_response(file_path: str, content_type: str = None) -> Optional[HttpResponse]:
+    """
+    构造由反向代理发送文件内容的空响应
+    X-Sendfile 直接使用文件绝对路径，X-Accel-Redirect 只能映射 MEDIA_ROOT 下的文件
+    :param file_path: 文件路径
+    :param content_type: 内容类型
+    :return: HttpResponse，无法映射时返回 None
+    """
+    full_path = os.path.realpath(file_path)
+    if not os.path.isfile(full_path):
+        raise FileNotFoundError(f"文件不存在: {file_path}")
+
+    header = getattr(settings, "SENDFILE_HEADER", "X-Accel-Redirect")
+    if header != "X-Accel-Redirect":
+        response = HttpResponse(content_type=content_type)
+        response[header] = full_path
+        return response
+
+    media_root = os.path.realpath(settings.MEDIA_ROOT)
+    if os.path.commonpath([media_root, full_path]) != media_root:
+        return None
+    location = getattr(settings, "SENDFILE_URL", "/protected/").rstrip("/")
+    relative_path = os.path.relpath(full_path, media_root).replace(os.sep, "/")
+    response = HttpResponse(content_type=content_type)
+    response[header] = escape_uri_path(f"{location}/{relative_path}")
+    return response
+
+
 def file_response(
     file_path: str,
     filename: str = None,
     content_type: str = None,
     as_attachment: bool = True,
-) -> FileResponse:
+    use_sendfile: Optional[bool] = None,
+) -> Union[FileResponse, HttpResponse]:
     """
     文件响应
+    开启 sendfile 时由 nginx / Apache 通过 sendfile(2) 发送文件，否则由 Django 按 1MB 分块发送
     :param file_path: 文件路径
     :param filename: 文件名
     :param content_type: 内容类型
     :param as_attachment: 是否作为附件下载
-    :return: FileResponse
+    :param use_sendfile: 是否交由反向代理发送，默认跟随 USE_SENDFILE 配置
+    :return: FileResponse 或 HttpResponse
     """
-    response = FileResponse(open(file_path, "rb"), content_type=content_type)
+    if use_sendfile is None:
+        use_sendfile = getattr(settings, "USE_SENDFILE", False)
+
+    response = _sendfile_response(file_path, content_type) if use_sendfile else None
+    if response is None:
+        response = FileResponse(open(file_path, "rb"), content_type=content_type)
+        # 服务器提供 wsgi.file_wrapper 时同样使用该块大小
+        response.block_size = FILE_BLOCK_SIZE
+
     if filename and as_attachment:
         response["Content-Disposition"] = f'attachment; filename="{filename}"'
     return response
@@ -259,3 +429,40 @@ def stream_response(
     if filename and as_attachment:
         response["Content-Disposition"] = f'attachment; filename="{filename}"'
     return response
+
+
+def json_stream_response(rows: Any, chunk_size: int = 500) -> StreamingHttpResponse:
+    """
+    流式输出 JSON 数组
+    查询集通过 iterator 按块读取，每块编码后作为一个分片输出，内存占用与结果总数无关
+    :param rows: 查询集（通常为 values() 查询集）或可迭代的行数据
+    :param chunk_size: 每块行数
+    :return: StreamingHttpResponse
+    """
+    iterator = rows.iterator(chunk_size=chunk_size) if hasattr(rows, "iterator") else iter(rows)
+    default = ApiJsonRenderer._encoder.default
+
+    if orjson is not None:
+        options = ApiJsonRenderer.orjson_options
+
+        def dumps(row: Any) -> bytes:
+            return orjson.dumps(row, default=default, option=options)
+
+    else:
+
+        def dumps(row: Any) -> bytes:
+            return json.dumps(row, default=default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def generate() -> Any:
+        yield b"["
+        first = True
+        while True:
+            batch = list(islice(iterator, chunk_size))
+            if not batch:
+                break
+            chunk = b",".join(map(dumps, batch))
+            yield chunk if first else b"," + chunk
+            first = False
+        yield b"]"
+
+    return StreamingHttpResponse(generate(), content_type="application/json")
@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Optional, Type
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from django.conf import settings
 from django.urls import include, path, re_path
@@ -13,6 +14,48 @@ from rest_framework_nested.routers import NestedDefaultRouter
 from utils.error import BusinessError, ErrorCode
 
 
+@lru_cache(maxsize=None)
+def _resolve_view(path: str) -> Any:
+    """按点分路径导入视图，结果按路径缓存"""
+    return import_string(path)
+
+
+# (视图, 初始化参数) -> as_view() 生成的视图函数
+_VIEW_FUNCS: Dict[Any, Any] = {}
+
+
+def _as_view(view: Any, initkwargs: Dict[str, Any]) -> Any:
+    """
+    生成视图函数，相同视图和参数重复注册时复用同一个视图函数
+    :param view: 视图类
+    :param initkwargs: 视图初始化参数
+    """
+    try:
+        key = (view, frozenset(initkwargs.items()))
+        hash(key)
+    except TypeError:
+        # 参数值不可哈希时不做缓存
+        return view.as_view(**initkwargs)
+
+    func = _VIEW_FUNCS.get(key)
+    if func is None:
+        func = _VIEW_FUNCS[key] = view.as_view(**initkwargs)
+    return func
+
+
+@lru_cache(maxsize=None)
+def _basename_for(viewset: Type[viewsets.ViewSet]) -> str:
+    """按视图集类计算默认基础名称，结果按类缓存"""
+    queryset = getattr(viewset, "queryset", None)
+    if queryset is not None:
+        return queryset.model._meta.object_name.lower()
+
+    if hasattr(viewset, "model"):
+        return viewset.model._meta.object_name.lower()
+
+    return viewset.__name__.lower().replace("viewset", "")
+
+
 class CustomRouter(DefaultRouter):
     """自定义路由器"""
 
@@ -23,14 +66,7 @@ class CustomRouter(DefaultRouter):
 
     def get_default_basename(self, viewset: Type[viewsets.ViewSet]) -> str:
         """获取默认基础名称"""
-        queryset = getattr(viewset, "queryset", None)
-        if queryset is not None:
-            return queryset.model._meta.object_name.lower()
-
-        if hasattr(viewset, "model"):
-            return viewset.model._meta.object_name.lower()
-
-        return viewset.__name__.lower().replace("viewset", "")
+        return _basename_for(viewset)
 
 
 class APIRouter:
@@ -43,6 +79,15 @@ class APIRouter:
         self.api_version = getattr(settings, "API_VERSION", "v1")
         self.api_title = getattr(settings, "API_TITLE", "API文档")
         self.api_description = getattr(settings, "API_DESCRIPTION", "")
+        # API根目录信息缓存，注册新视图时失效
+        self._api_root_dict_cache: Optional[Dict[str, Any]] = None
+        # (标题, 描述, 版本) -> API文档模式
+        self._schema_patterns: Dict[Tuple[str, str, str], List[Any]] = {}
+        # 通过 register_api_view 注册的URL模式，生成 urls 时与路由URL合并
+        self._extra_patterns: List[Any] = []
+        # 生成后的URL模式；注册新视图时原地更新，已引用它的 urlpatterns 也能看到
+        self._patterns: List[Any] = []
+        self._urlpatterns: Optional[List[Any]] = None
 
     def register_viewset(
         self,
@@ -73,9 +118,34 @@ class APIRouter:
             else:
                 # 注册到主路由
                 self.router.register(prefix, viewset, basename=basename)
+            self._invalidate_urls()
         except Exception as e:
             raise BusinessError(error_code=ErrorCode.SYSTEM_ERROR, message=f"注册视图集失败: {str(e)}")
 
+    def register_many(self, specs: List[Tuple[Any, ...]]) -> None:
+        """
+        批量注册视图集到主路由，一次写入注册表，只使路由缓存失效一次
+        :param specs: (URL前缀, 视图集类[, 基础名称]) 元组列表
+        """
+        basenames = {basename for _, _, basename in self.router.registry}
+        entries = []
+        for spec in specs:
+            prefix, viewset, basename = (*spec, None)[:3]
+            basename = basename or self.router.get_default_basename(viewset)
+            # 与 DRF 的 register 一致，不允许重复的基础名称
+            if basename in basenames:
+                raise BusinessError(
+                    error_code=ErrorCode.SYSTEM_ERROR,
+                    message=f"注册视图集失败: 基础名称 '{basename}' 已被注册",
+                )
+            basenames.add(basename)
+            entries.append((prefix, viewset, basename))
+
+        self.router.registry.extend(entries)
+        # 清除路由器缓存的URL，只重新生成一次
+        self.router.__dict__.pop("_urls", None)
+        self._invalidate_urls()
+
     def register_api_view(
         self,
         pattern: str,
@@ -93,10 +163,12 @@ class APIRouter:
         try:
             # 如果是字符串，尝试导入
             if isinstance(view, str):
-                view = import_string(view)
+                view = _resolve_view(view)
 
             # 添加到路由
-            self.router.urls.append(path(pattern, view.as_view(**(initkwargs or {})), name=name))
+            # 不能追加到 router.urls：那是路由器的缓存列表，注册视图集时会被丢弃重建
+            self._extra_patterns.append(path(pattern, _as_view(view, initkwargs or {}), name=name))
+            self._invalidate_urls()
         except Exception as e:
             raise BusinessError(error_code=ErrorCode.SYSTEM_ERROR, message=f"注册API视图失败: {str(e)}")
 
@@ -105,6 +177,13 @@ class APIRouter:
         if not settings.DEBUG:
             return []
 
+        key = (self.api_title, self.api_description, self.api_version)
+        if key not in self._schema_patterns:
+            self._schema_patterns[key] = self._build_api_schema_patterns()
+        return self._schema_patterns[key]
+
+    def _build_api_schema_patterns(self) -> List[Any]:
+        """生成API文档模式"""
         schema_view = get_schema_view(
             title=self.api_title,
             description=self.api_description,
@@ -130,26 +209,48 @@ class APIRouter:
             path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
         ]
 
-    def get_urls(self) -> List[Any]:
-        """获取所有URL模式"""
-        # 获取所有路由URL
-        urls = self.router.urls
-
-        # 添加嵌套路由URL
-        for nested_router in self.nested_routers.values():
-            urls.extend(nested_router.urls)
+    def _build_patterns(self) -> List[Any]:
+        """生成URL模式，不向路由器缓存的 router.urls 中追加"""
+        # 路由URL、API视图URL、嵌套路由URL和API文档URL一次拼接
+        return [
+            *self.router.urls,
+            *self._extra_patterns,
+            *(url for nested_router in self.nested_routers.values() for url in nested_router.urls),
+            *self.get_api_schema_patterns(),
+        ]
 
-        # 添加API文档URL
-        urls.extend(self.get_api_schema_patterns())
+    def _invalidate_urls(self) -> None:
+        """注册新视图后更新缓存：URL已生成时原地重建，未生成时等首次获取再生成"""
+        self._api_root_dict_cache = None
+        if self._urlpatterns is not None:
+            self._patterns[:] = self._build_patterns()
 
-        # 添加API版本前缀
-        if self.api_version:
-            return [path(f"{self.api_version}/", include((urls, "api"), namespace=self.api_version))]
+    @property
+    def urls(self) -> List[Any]:
+        """
+        所有URL模式，首次获取时生成，之后多次获取返回同一个列表
+        之后注册的视图会原地更新到该列表中，模块导入时已赋值的 urlpatterns 同样生效
+        """
+        if self._urlpatterns is None:
+            self._patterns[:] = self._build_patterns()
+            # 添加API版本前缀
+            if self.api_version:
+                self._urlpatterns = [
+                    path(f"{self.api_version}/", include((self._patterns, "api"), namespace=self.api_version))
+                ]
+            else:
+                self._urlpatterns = self._patterns
+        return self._urlpatterns
 
-        return urls
+    def get_urls(self) -> List[Any]:
+        """获取所有URL模式"""
+        return self.urls
 
     def get_api_root_dict(self) -> Dict[str, Any]:
         """获取API根目录信息"""
+        if self._api_root_dict_cache is not None:
+            return self._api_root_dict_cache
+
         api_root_dict = {}
 
         # 添加视图集URL
@@ -163,6 +264,7 @@ class APIRouter:
                 key = f"{parent_prefix}/{prefix}"
                 api_root_dict[key] = basename or self.router.get_default_basename(viewset)
 
+        self._api_root_dict_cache = api_root_dict
         return api_root_dict
 
 
@@ -173,7 +275,7 @@ router = APIRouter()
 app_name = "api"
 
 # 生成URL模式列表
-urlpatterns = router.get_urls()
+urlpatterns = router.urls
 
 """
 使用示例:
@@ -181,6 +283,12 @@ urlpatterns = router.get_urls()
 # 注册普通视图集
 router.register_viewset('users', UserViewSet)
 
+# 批量注册视图集
+router.register_many([
+    ('users', UserViewSet),
+    ('roles', RoleViewSet, 'role'),
+])
+
 # 注册嵌套视图集
 router.register_viewset(
     prefix='posts',
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
-from typing import Any, Optional, Type, Union
+from random import choice
+from typing import Any, Callable, Optional, Tuple, Type, Union
 
 from django.conf import settings
 from django.core.cache import cache
@@ -11,6 +12,8 @@ from django.utils.module_loading import import_string
 DATABASE_MAPPING = getattr(settings, "DATABASE_APPS_MAPPING", {})
 DATABASE_REPLICATION = getattr(settings, "DATABASE_REPLICATION", {})
 DATABASE_CACHE_TTL = getattr(settings, "DATABASE_CACHE_TTL", 300)  # 缓存5分钟
+# 映射中出现的数据库别名集合
+MAPPED_DATABASES = frozenset(DATABASE_MAPPING.values())
 
 
 class BaseDBRouter:
@@ -53,32 +56,29 @@ class BaseDBRouter:
 class ReplicationRouter(BaseDBRouter):
     """读写分离路由器"""
 
+    def __init__(self):
+        super().__init__()
+        # 按应用标签预先展开主库和从库配置
+        self._masters = {app: cfg.get("master") for app, cfg in DATABASE_REPLICATION.items()}
+        self._replicas = {app: tuple(cfg.get("replicas", ())) for app, cfg in DATABASE_REPLICATION.items()}
+
     def db_for_read(self, model: Type[models.Model], **hints) -> Optional[str]:
         """处理读操作路由"""
-        # 检查是否强制主库读取
-        if hints.get("force_master"):
-            return self.db_for_write(model)
-
-        # 获取应用标签
         app_label = self._get_app_label(model)
 
-        # 检查是否配置了从库
-        if app_label in DATABASE_REPLICATION:
-            replicas = DATABASE_REPLICATION[app_label].get("replicas", [])
-            if replicas:
-                from random import choice
-
-                return choice(replicas)
+        # 检查是否强制主库读取
+        if hints.get("force_master"):
+            return self._masters.get(app_label)
 
-        # 返回主库
-        return self.db_for_write(model)
+        # 有从库时随机选择一个，否则返回主库
+        replicas = self._replicas.get(app_label)
+        if replicas:
+            return choice(replicas)
+        return self._masters.get(app_label)
 
     def db_for_write(self, model: Type[models.Model], **hints) -> Optional[str]:
         """处理写操作路由"""
-        app_label = self._get_app_label(model)
-        if app_label in DATABASE_REPLICATION:
-            return DATABASE_REPLICATION[app_label].get("master")
-        return None
+        return self._masters.get(self._get_app_label(model))
 
 
 class MappingRouter(BaseDBRouter):
@@ -86,37 +86,13 @@ class MappingRouter(BaseDBRouter):
 
     def db_for_read(self, model: Type[models.Model], **hints) -> Optional[str]:
         """处理读操作路由"""
-        app_label = self._get_app_label(model)
-        cache_key = self._get_cache_key("read", app_label)
-
-        # 尝试从缓存获取
-        db = self._get_from_cache(cache_key)
-        if db is not None:
-            return db
-
-        # 从配置获取
-        db = DATABASE_MAPPING.get(app_label)
-        if db:
-            self._set_to_cache(cache_key, db)
-
-        return db
+        # 映射在进程内不变，直接查字典，不经过缓存后端
+        return DATABASE_MAPPING.get(self._get_app_label(model))
 
     def db_for_write(self, model: Type[models.Model], **hints) -> Optional[str]:
         """处理写操作路由"""
-        app_label = self._get_app_label(model)
-        cache_key = self._get_cache_key("write", app_label)
-
-        # 尝试从缓存获取
-        db = self._get_from_cache(cache_key)
-        if db is not None:
-            return db
-
-        # 从配置获取
-        db = DATABASE_MAPPING.get(app_label)
-        if db:
-            self._set_to_cache(cache_key, db)
-
-        return db
+        # 映射在进程内不变，直接查字典，不经过缓存后端
+        return DATABASE_MAPPING.get(self._get_app_label(model))
 
     def allow_relation(self, obj1: models.Model, obj2: models.Model, **hints) -> Optional[bool]:
         """判断是否允许关系"""
@@ -137,7 +113,7 @@ class MappingRouter(BaseDBRouter):
                 app_label = self._get_app_label(model)
 
         # 检查是否允许迁移
-        if db in DATABASE_MAPPING.values():
+        if db in MAPPED_DATABASES:
             return DATABASE_MAPPING.get(app_label) == db
         elif app_label in DATABASE_MAPPING:
             return False
@@ -151,6 +127,7 @@ class ShardingRouter(BaseDBRouter):
     def __init__(self):
         super().__init__()
         self.sharding_config = getattr(settings, "DATABASE_SHARDING", {})
+        self._shard_dbs = frozenset(self.sharding_config.values())
         self.shard_key_func = self._get_shard_key_func()
 
     def _get_shard_key_func(self) -> callable:
@@ -194,7 +171,7 @@ class ShardingRouter(BaseDBRouter):
     def allow_migrate(self, db: str, app_label: str, model_name: Optional[str] = None, **hints) -> Optional[bool]:
         """控制迁移操作"""
         # 允许所有分片数据库进行迁移
-        return db in self.sharding_config.values()
+        return db in self._shard_dbs
 
 
 class DatabaseRouter(BaseDBRouter):
@@ -203,31 +180,47 @@ class DatabaseRouter(BaseDBRouter):
     def __init__(self):
         super().__init__()
         self.routers = [ReplicationRouter(), MappingRouter(), ShardingRouter()]
+        # 预先取出各子路由器实现的绑定方法，每次ORM查询只需遍历调用
+        self._read = self._dispatch_table("db_for_read")
+        self._write = self._dispatch_table("db_for_write")
+        self._relation = self._dispatch_table("allow_relation")
+        self._migrate = self._dispatch_table("allow_migrate")
 
-    def _route_to_database(self, method_name: str, *args, **hints) -> Optional[str]:
-        """路由到数据库"""
-        for router in self.routers:
-            if hasattr(router, method_name):
-                result = getattr(router, method_name)(*args, **hints)
-                if result is not None:
-                    return result
-        return None
+    def _dispatch_table(self, method_name: str) -> Tuple[Callable[..., Any], ...]:
+        """获取实现了指定方法的子路由器的绑定方法"""
+        return tuple(getattr(router, method_name) for router in self.routers if hasattr(router, method_name))
 
     def db_for_read(self, model: Type[models.Model], **hints) -> Optional[str]:
         """处理读操作路由"""
-        return self._route_to_database("db_for_read", model, **hints)
+        for func in self._read:
+            result = func(model, **hints)
+            if result is not None:
+                return result
+        return None
 
     def db_for_write(self, model: Type[models.Model], **hints) -> Optional[str]:
         """处理写操作路由"""
-        return self._route_to_database("db_for_write", model, **hints)
+        for func in self._write:
+            result = func(model, **hints)
+            if result is not None:
+                return result
+        return None
 
     def allow_relation(self, obj1: models.Model, obj2: models.Model, **hints) -> Optional[bool]:
         """判断是否允许关系"""
-        return self._route_to_database("allow_relation", obj1, obj2, **hints)
+        for func in self._relation:
+            result = func(obj1, obj2, **hints)
+            if result is not None:
+                return result
+        return None
 
     def allow_migrate(self, db: str, app_label: str, model_name: Optional[str] = None, **hints) -> Optional[bool]:
         """控制迁移操作"""
-        return self._route_to_database("allow_migrate", db, app_label, model_name, **hints)
+        for func in self._migrate:
+            result = func(db, app_label, model_name, **hints)
+            if result is not None:
+                return result
+        return None
 
 
 """
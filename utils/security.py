@@ -4,7 +4,6 @@ from pydantic import BaseModel, Field, validator
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.middleware.csrf import CsrfViewMiddleware
 from django.utils.html import escape
-import bleach
 import functools
 import logging
 import re
@@ -14,6 +13,15 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=Callable[..., Any])
 
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "TRACE"))
+BODY_METHODS = frozenset(("POST", "PUT", "PATCH"))
+
+@functools.lru_cache(maxsize=1)
+def _bleach() -> Any:
+    """获取 bleach 模块，首次调用时导入；bleach 依赖 html5lib，导入较慢，管理命令等场景用不到"""
+    import bleach
+    return bleach
+
 class SecurityConfig(BaseModel):
     """安全配置模型"""
     xss_protection: bool = Field(default=True, description="是否启用XSS防护")
@@ -36,9 +44,9 @@ class SecurityConfig(BaseModel):
         """验证可信源"""
         return [origin.lower() for origin in v]
 
-@dataclass
+@dataclass(slots=True)
 class SecurityContext:
-    """安全上下文"""
+    """安全上下文（每个请求创建一次，使用 __slots__ 减少分配开销）"""
     request: HttpRequest
     config: SecurityConfig
     xss_filter: "XSSFilter"
@@ -52,19 +60,30 @@ class SecurityMiddleware:
         self.config = SecurityConfig(**(getattr(settings, "SECURITY_CONFIG", {})))
         self.xss_filter = XSSFilter()
         self.sql_filter = SQLInjectionFilter()
-
-    def __call__(self, request: HttpRequest) -> HttpResponse:
-        context = SecurityContext(
-            request=request,
-            config=self.config,
-            xss_filter=self.xss_filter,
-            sql_filter=self.sql_filter
+        # 配置在进程内不变，预先展开为元组，避免每个请求/响应重复遍历
+        self._header_items = tuple(self.config.security_headers.items())
+        self._trusted_origins = tuple(self.config.csrf_trusted_origins)
+        self._csrf_middleware = CsrfViewMiddleware(get_response)
+        self._any_check = (
+            self.config.csrf_protection
+            or self.config.xss_protection
+            or self.config.sql_injection_protection
         )
 
-        try:
-            self._pre_process_request(context)
-        except Exception as e:
-            return JsonResponse({"error": str(e)}, status=403)
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        # 所有检查都关闭时不创建上下文，直接处理请求
+        if self._any_check:
+            context = SecurityContext(
+                request=request,
+                config=self.config,
+                xss_filter=self.xss_filter,
+                sql_filter=self.sql_filter
+            )
+
+            try:
+                self._pre_process_request(context)
+            except Exception as e:
+                return JsonResponse({"error": str(e)}, status=403)
 
         response = self.get_response(request)
         return self._process_response(response)
@@ -82,33 +101,29 @@ class SecurityMiddleware:
 
     def _process_response(self, response: HttpResponse) -> HttpResponse:
         """响应处理"""
-        for header, value in self.config.security_headers.items():
+        for header, value in self._header_items:
             response[header] = value
         return response
 
     def _check_csrf(self, context: SecurityContext) -> None:
         """CSRF检查"""
-        if context.request.method not in ("GET", "HEAD", "OPTIONS", "TRACE"):
-            csrf_middleware = CsrfViewMiddleware(self.get_response)
+        if context.request.method not in SAFE_METHODS:
             origin = context.request.META.get("HTTP_ORIGIN", "")
-            
-            if origin and not any(
-                origin.endswith(trusted) for trusted in context.config.csrf_trusted_origins
-            ):
+
+            if origin and not origin.endswith(self._trusted_origins):
                 raise PermissionError("CSRF check failed")
 
-            reason = csrf_middleware.process_view(context.request, None, (), {})
+            reason = self._csrf_middleware.process_view(context.request, None, (), {})
             if reason:
                 raise PermissionError(str(reason))
 
     def _check_xss(self, context: SecurityContext) -> None:
         """XSS检查"""
-        if context.request.method in ("POST", "PUT", "PATCH"):
-            if hasattr(context.request, "body"):
-                cleaned_body = self.xss_filter.clean(
-                    context.request.body.decode("utf-8")
-                )
-                if cleaned_body != context.request.body.decode("utf-8"):
+        if context.request.method in BODY_METHODS:
+            if hasattr(context.request, "body") and self.xss_filter.may_contain_xss(context.request.body):
+                raw = context.request.body.decode("utf-8")
+                cleaned_body = self.xss_filter.clean(raw)
+                if cleaned_body != raw:
                     raise ValueError("Potential XSS attack detected")
 
             if context.request.POST:
@@ -121,22 +136,41 @@ class SecurityMiddleware:
 
     def _check_sql_injection(self, context: SecurityContext) -> None:
         """SQL注入检查"""
-        for key, value in context.request.GET.items():
-            if self.sql_filter.is_suspicious(value):
+        key = self.sql_filter.find_suspicious(context.request.GET)
+        if key is not None:
+            raise ValueError(
+                f"Potential SQL injection detected in parameter: {key}"
+            )
+
+        if context.request.method in BODY_METHODS:
+            key = self.sql_filter.find_suspicious(context.request.POST)
+            if key is not None:
                 raise ValueError(
-                    f"Potential SQL injection detected in parameter: {key}"
+                    f"Potential SQL injection detected in field: {key}"
                 )
 
-        if context.request.method in ("POST", "PUT", "PATCH"):
-            for key, value in context.request.POST.items():
-                if self.sql_filter.is_suspicious(value):
-                    raise ValueError(
-                        f"Potential SQL injection detected in field: {key}"
-                    )
-
 class XSSFilter:
     """XSS过滤器"""
 
+    # 各规则合并为一个交替正则，一次扫描完成全部匹配；script 规则需要跨行匹配
+    patterns: Dict[str, str] = {
+        "script": r"(?s:<script.*?>.*?</script>)",
+        "event": r"\bon\w+\s*=",
+        "javascript": r"javascript:",
+        "data": r"data:",
+    }
+    _combined = re.compile("|".join(f"(?:{p})" for p in patterns.values()), re.IGNORECASE)
+    # 清理时仍按顺序逐条替换：删除一处匹配可能拼出新的匹配（如 "datjavascript:a:" -> "data:"），
+    # 合并的正则只用于判断是否需要清理
+    _rules = tuple(re.compile(p, re.IGNORECASE) for p in patterns.values())
+    # 不含这些字符时 bleach 不会改动文本：html5lib 会转义 <>&，
+    # 并把 \t、\n 以外的 C0 控制字符（含 \r、\x00）改写为 "?"
+    _markup = re.compile(r"[<>&\x00-\x08\x0b-\x1f]")
+    # 原始字节上的快速预检：任一规则或 bleach 改写都至少需要命中其中一项
+    # （<>&、= 以及 \t、\n 以外的 C0 控制字符）；
+    # 非ASCII字节一律放行到完整检查，避免 Unicode 大小写折叠带来的漏判
+    _trigger = re.compile(rb"[<>&=\x00-\x08\x0b-\x1f\x80-\xff]|javascript:|data:", re.IGNORECASE)
+
     def __init__(self) -> None:
         self.allowed_tags: Set[str] = {
             "a", "abbr", "acronym", "b", "blockquote", "code",
@@ -150,29 +184,35 @@ class XSSFilter:
             "acronym": ["title"],
         }
 
-        self.patterns = {
-            "script": re.compile(r"<script.*?>.*?</script>", re.IGNORECASE | re.DOTALL),
-            "event": re.compile(r"\bon\w+\s*=", re.IGNORECASE),
-            "javascript": re.compile(r"javascript:", re.IGNORECASE),
-            "data": re.compile(r"data:", re.IGNORECASE),
-        }
-
     def clean(self, text: str) -> str:
         """清理文本"""
         if not text:
             return text
 
-        cleaned_text = bleach.clean(
+        # 常见的纯文本输入跳过 bleach 的HTML解析，只做一次正则扫描
+        if self._markup.search(text) is None:
+            return self._strip(text)
+
+        cleaned_text = _bleach().clean(
             text,
             tags=self.allowed_tags,
             attributes=self.allowed_attributes,
             strip=True
         )
 
-        for pattern in self.patterns.values():
-            cleaned_text = pattern.sub("", cleaned_text)
+        return self._strip(cleaned_text)
+
+    def _strip(self, text: str) -> str:
+        """按顺序删除各规则的匹配，没有任何匹配时只扫描一次"""
+        if self._combined.search(text) is None:
+            return text
+        for rule in self._rules:
+            text = rule.sub("", text)
+        return text
 
-        return cleaned_text
+    def may_contain_xss(self, data: bytes) -> bool:
+        """检查原始字节是否可能需要清理，返回 False 时 clean 必定原样返回"""
+        return self._trigger.search(data) is not None
 
     def escape(self, text: str) -> str:
         """转义文本"""
@@ -181,47 +221,62 @@ class XSSFilter:
 class SQLInjectionFilter:
     """SQL注入过滤器"""
 
-    def __init__(self) -> None:
-        self.patterns = [
-            re.compile(pattern, re.IGNORECASE)
-            for pattern in [
-                r"(\b(select|insert|update|delete|drop|union|exec)\b)",
-                r"(--)",
-                r"(;)",
-                r"(')",
-                r"(\/\*.*?\*\/)",
-                r"(\b(or|and)\b\s+\d+\s*[=<>])",
-                r"(\b(or|and)\b\s+\w+\s*[=<>])",
-            ]
-        ]
+    patterns: List[str] = [
+        r"(\b(select|insert|update|delete|drop|union|exec)\b)",
+        r"(--)",
+        r"(;)",
+        r"(')",
+        r"(\/\*.*?\*\/)",
+        r"(\b(or|and)\b\s+\d+\s*[=<>])",
+        r"(\b(or|and)\b\s+\w+\s*[=<>])",
+    ]
+    _combined = re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+    # 清理时按顺序逐条替换，原因同 XSSFilter._rules
+    _rules = tuple(re.compile(p, re.IGNORECASE) for p in patterns)
 
     def is_suspicious(self, text: str) -> bool:
         """检查是否包含可疑内容"""
         if not text:
             return False
-        return any(pattern.search(text) for pattern in self.patterns)
+        return self._combined.search(text) is not None
+
+    def find_suspicious(self, params: Dict[str, str]) -> Optional[str]:
+        """
+        查找包含可疑内容的参数，返回第一个可疑参数名，没有则返回 None
+        先把所有值拼接后整体扫描一次，命中时再逐个定位；
+        拼接可能产生跨值的误匹配，但逐个定位时会被排除，不会漏判
+        """
+        if not params or not self._combined.search("\x1f".join(params.values())):
+            return None
+        for key, value in params.items():
+            if self.is_suspicious(value):
+                return key
+        return None
 
     def clean(self, text: str) -> str:
         """清理文本"""
-        if not text:
+        if not text or self._combined.search(text) is None:
             return text
-        return functools.reduce(
-            lambda t, p: p.sub("", t),
-            self.patterns,
-            text
-        )
+        for rule in self._rules:
+            text = rule.sub("", text)
+        return text
+
+# 装饰器共用的过滤器实例，避免每次调用重新构造
+_XSS = XSSFilter()
+_SQL = SQLInjectionFilter()
 
 def xss_clean(func: T) -> T:
     """XSS清理装饰器"""
+    clean = _XSS.clean
+
     @functools.wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
-        xss_filter = XSSFilter()
         cleaned_args = [
-            xss_filter.clean(arg) if isinstance(arg, str) else arg
+            clean(arg) if isinstance(arg, str) else arg
             for arg in args
         ]
         cleaned_kwargs = {
-            key: xss_filter.clean(value) if isinstance(value, str) else value
+            key: clean(value) if isinstance(value, str) else value
             for key, value in kwargs.items()
         }
         return func(*cleaned_args, **cleaned_kwargs)
@@ -229,14 +284,15 @@ def xss_clean(func: T) -> T:
 
 def sql_injection_check(func: T) -> T:
     """SQL注入检查装饰器"""
+    is_suspicious = _SQL.is_suspicious
+
     @functools.wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
-        sql_filter = SQLInjectionFilter()
         for arg in args:
-            if isinstance(arg, str) and sql_filter.is_suspicious(arg):
+            if isinstance(arg, str) and is_suspicious(arg):
                 raise ValueError("Potential SQL injection detected")
         for value in kwargs.values():
-            if isinstance(value, str) and sql_filter.is_suspicious(value):
+            if isinstance(value, str) and is_suspicious(value):
                 raise ValueError("Potential SQL injection detected")
         return func(*args, **kwargs)
     return cast(T, wrapper)
@@ -0,0 +1,77 @@
+import io
+import os
+import secrets
+import tempfile
+from unittest import mock
+
+import pandas as pd
+from django.test import SimpleTestCase
+from openpyxl import Workbook, load_workbook
+
+from utils.other import excel
+from utils.other.excel import _write_styled_excel
+
+
+class WriteStyledExcelTests(SimpleTestCase):
+    """带样式Excel写入测试"""
+
+    def test_all_null_column(self):
+        """测试整列为空时正常导出"""
+        df = pd.DataFrame({"name": ["张三", "李四"], "phone": [None, None]})
+        output = io.BytesIO()
+        _write_styled_excel(output, df)
+
+        output.seek(0)
+        worksheet = load_workbook(output).active
+        self.assertEqual([cell.value for cell in worksheet[1]], ["name", "phone"])
+        self.assertEqual([cell.value for cell in worksheet[2]], ["张三", None])
+
+
+class ReadLargeExcelTests(SimpleTestCase):
+    """大文件（mmap）读取测试"""
+
+    def setUp(self):
+        # 随机字符串无法被压缩，保证文件超过 MMAP_THRESHOLD
+        self.df = pd.DataFrame({"code": [secrets.token_hex(32) for _ in range(30000)], "num": range(30000)})
+        handle, self.file_path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(handle)
+        self.df.to_excel(self.file_path, index=False, engine="openpyxl")
+        self.assertGreater(os.path.getsize(self.file_path), excel.MMAP_THRESHOLD)
+
+    def tearDown(self):
+        os.remove(self.file_path)
+
+    def test_openpyxl_fallback(self):
+        """测试未安装 calamine 时使用 openpyxl 读取大文件"""
+        with mock.patch.object(excel, "python_calamine", None):
+            df = excel.pandas_read_excel(self.file_path)
+            headers = excel._read_excel_headers(self.file_path)
+
+        pd.testing.assert_frame_equal(df, self.df)
+        self.assertEqual(headers, ["code", "num"])
+
+
+class ReadExcelHeadersTests(SimpleTestCase):
+    """Excel表头读取测试"""
+
+    def setUp(self):
+        # 表头从 B2 开始，首行首列为空
+        handle, self.file_path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(handle)
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet["B2"], worksheet["C2"] = "name", "age"
+        worksheet["B3"], worksheet["C3"] = "张三", 18
+        workbook.save(self.file_path)
+
+    def tearDown(self):
+        os.remove(self.file_path)
+
+    def test_headers_match_read_excel(self):
+        """测试模板校验读取的表头与导入时读取的列一致"""
+        headers = excel._read_excel_headers(self.file_path)
+        self.assertEqual(headers, excel.pandas_read_excel(self.file_path).columns.tolist())
+        self.assertNotIn("name", headers)
+
+        valid, _ = excel.validate_excel_template(self.file_path, ["name", "age"])
+        self.assertFalse(valid)
@@ -0,0 +1,38 @@
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, Storage
+from django.test import SimpleTestCase
+
+from utils.other.file import FileHandler
+
+
+class DeleteFileTests(SimpleTestCase):
+    """文件删除测试"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.storage = FileSystemStorage(location=self.tmp_dir.name)
+        self.handler = FileHandler(storage=self.storage)
+
+    def test_delete_existing_file(self):
+        """测试删除已存在的文件返回 True"""
+        self.storage.save("a.txt", ContentFile(b"data"))
+
+        self.assertTrue(self.handler.delete_file("a.txt"))
+        self.assertFalse(self.storage.exists("a.txt"))
+
+    def test_delete_missing_file(self):
+        """测试删除不存在的文件返回 False"""
+        self.assertFalse(self.handler.delete_file("missing.txt"))
+
+    def test_delete_on_other_storage(self):
+        """测试其他存储后端直接调用 delete"""
+        storage = mock.Mock(spec=Storage)
+        handler = FileHandler(storage=storage)
+
+        self.assertTrue(handler.delete_file("a.txt"))
+        storage.delete.assert_called_once_with("a.txt")
+        storage.exists.assert_not_called()
@@ -0,0 +1,69 @@
+from urllib.parse import parse_qs, urlparse
+
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from utils.pagination import CachedCountPaginator, FastKeysetPagination
+
+
+class CachedCountPaginatorTests(TestCase):
+    """缓存总数分页器测试"""
+
+    def setUp(self):
+        cache.clear()
+        Group.objects.bulk_create([Group(name=f"group{i}") for i in range(3)])
+
+    def test_count_cached(self):
+        """测试同一查询的总数只统计一次"""
+        queryset = Group.objects.order_by("pk")
+        with self.assertNumQueries(1):
+            self.assertEqual(CachedCountPaginator(queryset, 2).count, 3)
+
+        Group.objects.create(name="group3")
+        with self.assertNumQueries(0):
+            self.assertEqual(CachedCountPaginator(queryset, 2).count, 3)
+
+    def test_count_per_query(self):
+        """测试不同查询条件分别缓存"""
+        self.assertEqual(CachedCountPaginator(Group.objects.order_by("pk"), 2).count, 3)
+        self.assertEqual(CachedCountPaginator(Group.objects.filter(name="group0").order_by("pk"), 2).count, 1)
+
+    def test_empty_result(self):
+        """测试空查询直接返回 0，不访问数据库"""
+        with self.assertNumQueries(0):
+            self.assertEqual(CachedCountPaginator(Group.objects.none(), 2).count, 0)
+
+
+class FastKeysetPaginationTests(TestCase):
+    """键集分页器测试"""
+
+    def setUp(self):
+        Group.objects.bulk_create([Group(name=f"group{i}") for i in range(4)])
+        self.groups = list(Group.objects.order_by("pk"))
+        self.paginator = FastKeysetPagination()
+        self.paginator.page_size = 2
+
+    def paginate(self, **params):
+        request = Request(APIRequestFactory().get("/groups/", params))
+        return self.paginator.paginate_queryset(Group.objects.all(), request)
+
+    def test_first_page(self):
+        """测试首页返回下一页游标"""
+        results = self.paginate()
+
+        self.assertEqual(results, self.groups[:2])
+        self.assertTrue(self.paginator.has_next)
+        next_link = self.paginator.get_next_link()
+        self.assertEqual(parse_qs(urlparse(next_link).query)["cursor"], [str(self.groups[1].pk)])
+
+    def test_last_page_at_boundary(self):
+        """测试剩余记录恰好为一页时没有下一页"""
+        results = self.paginate(cursor=self.groups[1].pk)
+
+        self.assertEqual(results, self.groups[2:])
+        self.assertFalse(self.paginator.has_next)
+        self.assertIsNone(self.paginator.get_next_link())
+        self.assertIsNone(self.paginator.get_paginated_response([]).data["next"])
@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from utils.permissions import PermissionManager, _has_perms
+
+User = get_user_model()
+
+
+class PermissionManagerTests(TestCase):
+    """权限管理器缓存测试"""
+
+    def setUp(self):
+        cache.clear()
+        self.manager = PermissionManager()
+        self.user = User.objects.create_user(username="member", password="password")
+        self.view_group = Permission.objects.get(content_type__app_label="auth", codename="view_group")
+        self.add_group = Permission.objects.get(content_type__app_label="auth", codename="add_group")
+
+    def test_permission_format(self):
+        """测试权限格式与 user.has_perms 一致，包含用户组权限"""
+        group = Group.objects.create(name="editor")
+        group.permissions.add(self.add_group)
+        self.user.groups.add(group)
+        self.user.user_permissions.add(self.view_group)
+
+        self.assertEqual(self.manager.get_user_permissions(self.user), {"auth.view_group", "auth.add_group"})
+        self.assertTrue(self.user.has_perms(self.manager.get_user_permissions(self.user)))
+
+    def test_grant_visible_after_clear(self):
+        """测试授权并清除缓存后，下次读取即可获得新权限"""
+        self.assertEqual(self.manager.get_user_permissions(self.user), set())
+
+        self.user.user_permissions.add(self.view_group)
+        self.assertEqual(self.manager.get_user_permissions(self.user), set())
+
+        self.manager.clear_user_cache(self.user)
+        self.assertEqual(self.manager.get_user_permissions(self.user), {"auth.view_group"})
+
+    def test_clear_without_version(self):
+        """测试版本号缺失时清除缓存不报错，下次读取生成新的版本号"""
+        self.manager.get_user_permissions(self.user)
+        self.manager.cache_manager.delete(f"version:{self.user.pk}")
+        self.user.user_permissions.add(self.view_group)
+
+        self.manager.clear_user_cache(self.user)
+
+        self.assertEqual(self.manager.get_user_permissions(self.user), {"auth.view_group"})
+        self.assertIsNotNone(self.manager.cache_manager.get(f"version:{self.user.pk}"))
+
+
+class HasPermsTests(TestCase):
+    """请求级权限检查测试"""
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get("/")
+        self.view_group = Permission.objects.get(content_type__app_label="auth", codename="view_group")
+
+    def test_inactive_user(self):
+        """测试未激活用户没有任何权限"""
+        self.request.user = User.objects.create_user(username="inactive", is_active=False)
+        self.request.user.user_permissions.add(self.view_group)
+
+        self.assertFalse(_has_perms(self.request, ["auth.view_group"]))
+
+    def test_superuser(self):
+        """测试超级管理员拥有全部权限，且不查询数据库"""
+        self.request.user = User.objects.create_superuser(username="admin", password="password")
+
+        with self.assertNumQueries(0):
+            self.assertTrue(_has_perms(self.request, ["auth.view_group", "auth.delete_group"]))
+
+    def test_normal_user(self):
+        """测试普通用户按权限集合判断，同一请求内只获取一次权限"""
+        self.request.user = User.objects.create_user(username="member", password="password")
+        self.request.user.user_permissions.add(self.view_group)
+
+        self.assertTrue(_has_perms(self.request, ["auth.view_group"]))
+        self.assertFalse(_has_perms(self.request, ["auth.view_group", "auth.delete_group"]))
+        self.assertEqual(self.request._cached_perms, {"auth.view_group"})
@@ -0,0 +1,44 @@
+from django.http import HttpResponse
+from django.test import SimpleTestCase
+from django.urls import URLResolver, resolve
+from django.urls.resolvers import RegexPattern
+from django.views import View
+
+from utils.router import api
+from utils.router.api import APIRouter
+
+
+class LateView(View):
+    """测试用视图"""
+
+    def get(self, request):
+        return HttpResponse("ok")
+
+
+class APIRouterTests(SimpleTestCase):
+    """API路由测试"""
+
+    def test_register_api_view_after_urls(self):
+        """测试获取 urls 之后注册的API视图仍能被解析"""
+        router = APIRouter()
+        urlpatterns = router.urls
+
+        router.register_api_view("late/", LateView, name="late")
+
+        resolver = URLResolver(RegexPattern(r"^/"), urlpatterns)
+        match = resolver.resolve("/v1/late/")
+        self.assertEqual(match.url_name, "late")
+        self.assertIs(router.urls, urlpatterns)
+
+    def test_module_urlpatterns_follow_registration(self):
+        """测试模块导入后注册的API视图出现在模块的 urlpatterns 中"""
+        api.router.register_api_view("module-late/", LateView, name="module-late")
+        self.addCleanup(self._unregister, "module-late/")
+
+        match = resolve("/v1/module-late/", urlconf=api)
+        self.assertEqual(match.url_name, "module-late")
+
+    @staticmethod
+    def _unregister(pattern: str) -> None:
+        api.router._extra_patterns[:] = [p for p in api.router._extra_patterns if str(p.pattern) != pattern]
+        api.router._invalidate_urls()
@@ -0,0 +1,56 @@
+from django.test import SimpleTestCase
+
+from utils.security import SQLInjectionFilter, XSSFilter, sql_injection_check, xss_clean
+
+
+class XSSFilterTests(SimpleTestCase):
+    """XSS过滤器测试"""
+
+    def setUp(self):
+        self.xss_filter = XSSFilter()
+
+    def test_plain_text_unchanged(self):
+        """测试普通文本原样返回"""
+        self.assertEqual(self.xss_filter.clean("hello, 世界"), "hello, 世界")
+
+    def test_chained_payload(self):
+        """测试删除一处匹配后拼出的新匹配同样被删除"""
+        self.assertEqual(self.xss_filter.clean("datjavascript:a:"), "")
+
+    def test_xss_clean_decorator(self):
+        """测试装饰器清理字符串参数"""
+
+        @xss_clean
+        def echo(value, other=None):
+            return value, other
+
+        self.assertEqual(echo("datjavascript:a:", other="javascript:x"), ("", "x"))
+
+
+class SQLInjectionFilterTests(SimpleTestCase):
+    """SQL注入过滤器测试"""
+
+    def setUp(self):
+        self.sql_filter = SQLInjectionFilter()
+
+    def test_is_suspicious(self):
+        """测试可疑内容检测"""
+        self.assertTrue(self.sql_filter.is_suspicious("1 OR 1=1"))
+        self.assertTrue(self.sql_filter.is_suspicious("name'--"))
+        self.assertFalse(self.sql_filter.is_suspicious("hello world"))
+
+    def test_find_suspicious(self):
+        """测试定位可疑参数，跨值拼接出的匹配不算可疑"""
+        self.assertEqual(self.sql_filter.find_suspicious({"a": "ok", "b": "x; drop"}), "b")
+        self.assertIsNone(self.sql_filter.find_suspicious({"a": "x or", "b": "a = 1"}))
+
+    def test_sql_injection_check_decorator(self):
+        """测试装饰器拒绝可疑参数"""
+
+        @sql_injection_check
+        def query(value):
+            return value
+
+        self.assertEqual(query("hello"), "hello")
+        with self.assertRaises(ValueError):
+            query("1; drop table users")